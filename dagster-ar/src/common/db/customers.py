@@ -8,4 +8,15 @@ customers_columns = [
     "company_name",
     "is_supplier",
     "is_active",
+    "tenant",
 ]
+
+# PostgreSQL types of the bulk-loaded customer staging table.
+customer_staging_types = {
+    "id": "uuid",
+    "name": "text",
+    "company_name": "text",
+    "is_active": "boolean",
+    "is_supplier": "boolean",
+    "tenant": "text",
+}
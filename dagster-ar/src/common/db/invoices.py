@@ -1,3 +1,7 @@
+import pandas as pd
+
+from common.types.invoice import AccountingInvoiceStatus, AccountingInvoiceType
+
 invoice_columns = [
     "aging_bucket",
     "balance_amount",
@@ -13,17 +17,107 @@ invoice_columns = [
     "posted_at",
     "status",
     "tax_amount",
+    "tenant",
     "total_amount",
     "total_paid",
     "type",
 ]
 
+# Columns of the extracted invoices the transforms read, renamed on the way
+# to the invoice_columns they become.
+invoice_source_columns = {
+    "id": "invoice_id",
+    "contact_id": "customer_id",
+    "invoice_number": "invoice_number",
+    "currency": "currency",
+    "total_amount": "total_amount",
+    "paid_amount": "paid_amount",
+    "tax_amount": "tax_amount",
+    "invoice_at": "invoice_at",
+    "due_at": "due_at",
+    "posted_at": "posted_at",
+    "status": "status",
+    "type": "type",
+    "notes": "notes",
+    "tenant": "tenant",
+}
+
+# Monetary invoice_columns, carried as integer cents from transform to load.
+invoice_amount_columns = [
+    "balance_amount",
+    "paid_amount",
+    "tax_amount",
+    "total_amount",
+    "total_paid",
+]
+
+# pandas dtypes of the transformed invoices, keyed by invoice_columns. Casting
+# every chunk to these keeps one schema across chunks, even when a chunk's
+# column is entirely missing. Low-cardinality strings are categoricals and
+# other strings Arrow-backed, which keeps each chunk compact in memory.
+invoice_dtypes = {
+    "aging_bucket": "int8",
+    "balance_amount": "Int64",
+    "currency": "category",
+    "customer_id": "string[pyarrow]",
+    "days_overdue": "int32",
+    "due_at": "datetime64[ns, UTC]",
+    "invoice_at": "datetime64[ns, UTC]",
+    "invoice_id": "string[pyarrow]",
+    "invoice_number": "string[pyarrow]",
+    "notes": "string[pyarrow]",
+    "paid_amount": "Int64",
+    "posted_at": "string[pyarrow]",
+    "status": pd.CategoricalDtype(
+        [status.value for status in AccountingInvoiceStatus]
+    ),
+    "tax_amount": "Int64",
+    "tenant": "category",
+    "total_amount": "Int64",
+    "total_paid": "Int64",
+    "type": pd.CategoricalDtype([type_.value for type_ in AccountingInvoiceType]),
+}
+
+# Columns an invoice UPSERT overwrites from the staged row, so an invoice that
+# is voided, paid or re-totalled upstream is updated by the next delta.
 invoice_update_columns = [
     "customer_id",
     "invoice_number",
     "invoice_at",
     "due_at",
     "currency",
+    "total_amount",
+    "balance_amount",
+    "paid_amount",
+    "tax_amount",
     "days_overdue",
     "aging_bucket",
+    "status",
+    "type",
+    "notes",
+    "posted_at",
+    "tenant",
 ]
+
+# PostgreSQL types of the bulk-loaded staging table, keyed by invoice_columns.
+# Amounts are staged as the integer cents the transforms produce.
+invoice_staging_types = {
+    "aging_bucket": "integer",
+    "balance_amount": "bigint",
+    "currency": "text",
+    "customer_id": "uuid",
+    "days_overdue": "integer",
+    "due_at": "timestamptz",
+    "invoice_at": "timestamptz",
+    "invoice_id": "uuid",
+    "invoice_number": "text",
+    "notes": "text",
+    "paid_amount": "bigint",
+    "posted_at": "timestamptz",
+    "status": "text",
+    "tax_amount": "bigint",
+    "tenant": "text",
+    "total_amount": "bigint",
+    "total_paid": "bigint",
+    "type": "text",
+}
@@ -5,6 +5,24 @@ payments_columns = [
     "currency",
     "id",
     "invoice_id",
+    "tenant",
     "total_amount",
     "updated_at",
 ]
+
+# Columns the invoice transforms read from the transformed payments.
+payment_summary_columns = ["invoice_id", "total_amount"]
+
+# PostgreSQL types of the bulk-loaded payment staging table, keyed by the
+# transformed payment columns.
+payment_staging_types = {
+    "payment_id": "uuid",
+    "customer_id": "uuid",
+    "invoice_id": "uuid",
+    "account_id": "uuid",
+    "total_amount": "numeric",
+    "currency": "text",
+    "tenant": "text",
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz",
+}
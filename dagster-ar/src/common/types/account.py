@@ -3,32 +3,30 @@ from typing import Optional
 from enum import Enum
 
 
-@dataclasses.dataclass
 class AccountingAccountType(str, Enum):
     """
     Account types
     """
 
-    "ACCOUNTS_RECEIVABLE"
-    "ACCOUNTS_PAYABLE"
-    "BANK"
-    "CREDIT_CARD"
-    "FIXED_ASSET"
-    "LIABILITY"
-    "EQUITY"
-    "EXPENSE"
-    "REVENUE"
-    "OTHER"
+    ACCOUNTS_RECEIVABLE = "ACCOUNTS_RECEIVABLE"
+    ACCOUNTS_PAYABLE = "ACCOUNTS_PAYABLE"
+    BANK = "BANK"
+    CREDIT_CARD = "CREDIT_CARD"
+    FIXED_ASSET = "FIXED_ASSET"
+    LIABILITY = "LIABILITY"
+    EQUITY = "EQUITY"
+    EXPENSE = "EXPENSE"
+    REVENUE = "REVENUE"
+    OTHER = "OTHER"
 
 
-@dataclasses.dataclass
 class AccountingAccountStatus(str, Enum):
     """
     Account statuses
     """
 
-    "ACTIVE"
-    "ARCHIVED"
+    ACTIVE = "ACTIVE"
+    ARCHIVED = "ARCHIVED"
 
 
 @dataclasses.dataclass
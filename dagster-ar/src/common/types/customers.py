@@ -3,28 +3,24 @@ from enum import Enum
 from typing import Optional
 
 
-@dataclasses.dataclass
 class AccountingContactTax_exemption(str, Enum):
-    "FEDERAL_GOV"
-
-    "REGION_GOV"
-    "LOCAL_GOV"
-    "TRIBAL_GOV"
-    "CHARITABLE_ORG"
-    "RELIGIOUS_ORG"
-    "EDUCATIONAL_ORG"
-    "MEDICAL_ORG"
-    "RESALE"
-    "FOREIGN"
-    "OTHER"
+    FEDERAL_GOV = "FEDERAL_GOV"
+    REGION_GOV = "REGION_GOV"
+    LOCAL_GOV = "LOCAL_GOV"
+    TRIBAL_GOV = "TRIBAL_GOV"
+    CHARITABLE_ORG = "CHARITABLE_ORG"
+    RELIGIOUS_ORG = "RELIGIOUS_ORG"
+    EDUCATIONAL_ORG = "EDUCATIONAL_ORG"
+    MEDICAL_ORG = "MEDICAL_ORG"
+    RESALE = "RESALE"
+    FOREIGN = "FOREIGN"
+    OTHER = "OTHER"
 
 
-@dataclasses.dataclass
 class AccountingContactEmailsType(str, Enum):
-    "WORK"
-
-    "HOME"
-    "OTHER"
+    WORK = "WORK"
+    HOME = "HOME"
+    OTHER = "OTHER"
 
 
 @dataclasses.dataclass
@@ -33,14 +29,12 @@ class PropertyAccountingContactEmails:
     type: Optional[AccountingContactEmailsType]
 
 
-@dataclasses.dataclass
 class AccountingContactTelephonesType(str, Enum):
-    "WORK"
-
-    "HOME"
-    "OTHER"
-    "FAX"
-    "MOBILE"
+    WORK = "WORK"
+    HOME = "HOME"
+    OTHER = "OTHER"
+    FAX = "FAX"
+    MOBILE = "MOBILE"
 
 
 @dataclasses.dataclass
@@ -79,18 +73,16 @@ class PropertyAccountingContactShipping_address:
     country_code: Optional[str]
 
 
-@dataclasses.dataclass
 class AccountingContactPayment_methodsType(str, Enum):
-    "ACH"
-
-    "ALIPAY"
-    "CARD"
-    "GIROPAY"
-    "IDEAL"
-    "OTHER"
-    "PAYPAL"
-    "WIRE"
-    "CHECK"
+    ACH = "ACH"
+    ALIPAY = "ALIPAY"
+    CARD = "CARD"
+    GIROPAY = "GIROPAY"
+    IDEAL = "IDEAL"
+    OTHER = "OTHER"
+    PAYPAL = "PAYPAL"
+    WIRE = "WIRE"
+    CHECK = "CHECK"
 
 
 @dataclasses.dataclass
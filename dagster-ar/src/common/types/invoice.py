@@ -3,37 +3,35 @@ from typing import Optional
 from enum import Enum
 
 
-@dataclasses.dataclass
 class AccountingInvoiceStatus(str, Enum):
     """
     Invoice statuses
     """
 
-    "DRAFT"
-    "VOIDED"
-    "AUTHORIZED"
-    "PAID"
-    "PARTIALLY_PAID"
-    "PARTIALLY_REFUNDED"
-    "REFUNDED"
+    DRAFT = "DRAFT"
+    VOIDED = "VOIDED"
+    AUTHORIZED = "AUTHORIZED"
+    PENDING = "PENDING"
+    CANCELLED = "CANCELLED"
+    PAID = "PAID"
+    PARTIALLY_PAID = "PARTIALLY_PAID"
+    PARTIALLY_REFUNDED = "PARTIALLY_REFUNDED"
+    REFUNDED = "REFUNDED"
 
 
-@dataclasses.dataclass
 class AccountingInvoicePayment_collection_method(str, Enum):
     """
     Invoice payment collection methods
     """
 
-    "send_invoice"
-    "charge_automatically"
+    send_invoice = "send_invoice"
+    charge_automatically = "charge_automatically"
 
 
-@dataclasses.dataclass
 class AccountingInvoiceType(str, Enum):
-    "BILL"
-
-    "INVOICE"
-    "CREDITMEMO"
+    BILL = "BILL"
+    INVOICE = "INVOICE"
+    CREDITMEMO = "CREDITMEMO"
 
 
 @dataclasses.dataclass
@@ -0,0 +1,155 @@
+"""
+Compact records decoded from Unified API payloads.
+
+Each record keeps only the fields the pipeline reads, as a tuple rather than a
+dict of every nested field (line items, attachments, addresses, ...). Values
+are type-checked and enum fields validated while decoding, so malformed
+payloads fail at ingest instead of deep inside a transform or a load.
+"""
+
+from enum import Enum
+from typing import Any, Callable, Iterable, NamedTuple, Optional, TypeVar
+
+from common.types.customers import AccountingContactTax_exemption
+from common.types.invoice import AccountingInvoiceStatus, AccountingInvoiceType
+
+
+class InvoiceRecord(NamedTuple):
+    id: Optional[str]
+    contact_id: Optional[str]
+    invoice_number: Optional[str]
+    currency: Optional[str]
+    total_amount: Optional[float]
+    paid_amount: Optional[float]
+    tax_amount: Optional[float]
+    invoice_at: Optional[str]
+    due_at: Optional[str]
+    posted_at: Optional[str]
+    status: Optional[str]
+    type: Optional[str]
+    notes: Optional[str]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+class ContactRecord(NamedTuple):
+    id: Optional[str]
+    name: Optional[str]
+    company_name: Optional[str]
+    currency: Optional[str]
+    tax_exemption: Optional[str]
+    is_active: Optional[bool]
+    is_supplier: Optional[bool]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+class PaymentRecord(NamedTuple):
+    id: Optional[str]
+    contact_id: Optional[str]
+    invoice_id: Optional[str]
+    account_id: Optional[str]
+    total_amount: Optional[float]
+    currency: Optional[str]
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    raise TypeError(f"expected a string, got {type(value).__name__}")
+
+
+def _amount(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"expected a number, got {type(value).__name__}")
+    return float(value)
+
+
+def _flag(value: Any) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    raise TypeError(f"expected a boolean, got {type(value).__name__}")
+
+
+def _member_of(enum: type[Enum]) -> Callable[[Any], Optional[str]]:
+    """Validates a value against `enum`, keeping its plain string value."""
+
+    def convert(value: Any) -> Optional[str]:
+        return None if value is None else enum(value).value
+
+    return convert
+
+
+# Converter per record field, in field order.
+_CONVERTERS: dict[type, tuple[Callable[[Any], Any], ...]] = {
+    InvoiceRecord: (
+        _text,  # id
+        _text,  # contact_id
+        _text,  # invoice_number
+        _text,  # currency
+        _amount,  # total_amount
+        _amount,  # paid_amount
+        _amount,  # tax_amount
+        _text,  # invoice_at
+        _text,  # due_at
+        _text,  # posted_at
+        _member_of(AccountingInvoiceStatus),  # status
+        _member_of(AccountingInvoiceType),  # type
+        _text,  # notes
+        _text,  # created_at
+        _text,  # updated_at
+    ),
+    ContactRecord: (
+        _text,  # id
+        _text,  # name
+        _text,  # company_name
+        _text,  # currency
+        _member_of(AccountingContactTax_exemption),  # tax_exemption
+        _flag,  # is_active
+        _flag,  # is_supplier
+        _text,  # created_at
+        _text,  # updated_at
+    ),
+    PaymentRecord: (
+        _text,  # id
+        _text,  # contact_id
+        _text,  # invoice_id
+        _text,  # account_id
+        _amount,  # total_amount
+        _text,  # currency
+        _text,  # created_at
+        _text,  # updated_at
+    ),
+}
+
+R = TypeVar("R", InvoiceRecord, ContactRecord, PaymentRecord)
+
+
+def decode_page(page: Iterable[dict[str, Any]], record_type: type[R]) -> list[R]:
+    """
+    Decodes a page of API payloads into `record_type` records.
+
+    Raises:
+        ValueError: If a payload holds a value of the wrong type or outside
+            its enum, naming the record and field at fault.
+    """
+    fields = list(zip(record_type._fields, _CONVERTERS[record_type]))
+    records = []
+
+    for payload in page:
+        values = []
+        for name, convert in fields:
+            try:
+                values.append(convert(payload.get(name)))
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    f"Invalid {record_type.__name__} {payload.get('id')!r}, "
+                    f"field {name!r}: {e}"
+                ) from e
+        records.append(record_type._make(values))
+
+    return records
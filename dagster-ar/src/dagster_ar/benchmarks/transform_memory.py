@@ -0,0 +1,160 @@
+"""
+Memory footprint of the invoice transform, before and after tightening its
+dtypes.
+
+Builds a synthetic extract of `--invoices` invoices and `--payments` payments
+shaped like `frames_from_pages` output, then reports `memory_usage(deep=True)`
+of:
+
+- the frame the transform used to produce: object strings, float64 amounts
+  and int64 days/buckets, built through copy/merge/drop/rename;
+- the same invoices aged by `age_invoices`: categoricals, Arrow-backed
+  strings, integer cents and narrow integers, built in place;
+- the largest chunk held at once when aging in `INVOICE_CHUNK_SIZE` chunks.
+
+Run with `python -m dagster_ar.benchmarks.transform_memory`.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common.db.invoices import invoice_columns, invoice_source_columns
+from common.types.invoice import AccountingInvoiceStatus, AccountingInvoiceType
+from dagster_ar.defs.aging import classify_days_overdue
+from dagster_ar.defs.transforms import (
+    INVOICE_CHUNK_SIZE,
+    age_invoice_chunks,
+    age_invoices,
+    total_paid_by_invoice,
+)
+
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+STATUSES = [status.value for status in AccountingInvoiceStatus]
+TYPES = [type_.value for type_ in AccountingInvoiceType]
+
+
+def synthetic_invoices(num_invoices: int, rng: np.random.Generator) -> pd.DataFrame:
+    due_at = pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(
+        rng.integers(0, 365, num_invoices), unit="D"
+    )
+    ids = [f"{i:08x}-0000-4000-8000-000000000000" for i in range(num_invoices)]
+
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "contact_id": [
+                f"{i:08x}-0000-4000-8000-00000000c0de"
+                for i in rng.integers(0, 5_000, num_invoices)
+            ],
+            "invoice_number": [f"INV-{i}" for i in range(num_invoices)],
+            "currency": rng.choice(["USD", "EUR", "GBP", "KES"], num_invoices),
+            "total_amount": rng.integers(1_000, 1_000_000, num_invoices) / 100,
+            "paid_amount": None,
+            "tax_amount": rng.integers(0, 10_000, num_invoices) / 100,
+            "invoice_at": (due_at - pd.Timedelta(days=30)).strftime(ISO_FORMAT),
+            "due_at": due_at.strftime(ISO_FORMAT),
+            "posted_at": None,
+            "status": rng.choice(STATUSES, num_invoices),
+            "type": rng.choice(TYPES, num_invoices),
+            "notes": None,
+            "created_at": "2025-01-01T00:00:00Z",
+            "updated_at": "2025-01-01T00:00:00Z",
+            "tenant": "synthetic",
+        }
+    ).astype({column: object for column in ("currency", "status", "type")})
+
+
+def synthetic_payments(
+    invoices: pd.DataFrame, num_payments: int, rng: np.random.Generator
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "invoice_id": rng.choice(invoices["id"].to_numpy(), num_payments),
+            "total_amount": rng.integers(100, 100_000, num_payments) / 100,
+        }
+    )
+
+
+def legacy_transform(invoices: pd.DataFrame, payments: pd.DataFrame) -> pd.DataFrame:
+    """The invoice transform as it was before chunking and dtype tightening."""
+    invoices_df = pd.DataFrame(invoices)
+    invoices_df["invoice_at"] = pd.to_datetime(
+        invoices_df["invoice_at"], errors="coerce", utc=True
+    )
+    payments_summary = (
+        pd.DataFrame(payments)
+        .groupby("invoice_id")["total_amount"]
+        .sum()
+        .reset_index(name="total_paid")
+    )
+    merged = invoices_df.merge(
+        payments_summary, how="left", left_on="id", right_on="invoice_id"
+    )
+    merged = merged.drop(columns=["invoice_id"])
+    merged["total_paid"] = merged["total_paid"].fillna(0)
+    merged["balance_amount"] = merged["total_amount"] - merged["total_paid"]
+    merged["due_at"] = pd.to_datetime(merged["due_at"], errors="coerce", utc=True)
+    today = pd.Timestamp.now(tz="UTC")
+    merged["days_overdue"] = (today - merged["due_at"]).dt.days
+    merged["days_overdue"] = merged["days_overdue"].fillna(0).clip(lower=0)
+    merged["aging_bucket"] = classify_days_overdue(merged["days_overdue"])
+    ar_aging_df = merged.rename(
+        columns={"id": "invoice_id", "contact_id": "customer_id"}
+    )
+    return ar_aging_df[invoice_columns]
+
+
+def megabytes(frame: pd.DataFrame) -> float:
+    return frame.memory_usage(deep=True, index=False).sum() / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--invoices", type=int, default=500_000)
+    parser.add_argument("--payments", type=int, default=250_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    invoices = synthetic_invoices(args.invoices, rng)
+    payments = synthetic_payments(invoices, args.payments, rng)
+    today = pd.Timestamp.now(tz="UTC")
+
+    before = legacy_transform(invoices, payments)
+    after = age_invoices(
+        invoices[list(invoice_source_columns)].copy(),
+        total_paid_by_invoice(payments),
+        today,
+    )
+    largest_chunk = max(
+        megabytes(chunk)
+        for chunk in age_invoice_chunks(
+            (
+                invoices.iloc[start : start + INVOICE_CHUNK_SIZE][
+                    list(invoice_source_columns)
+                ].copy()
+                for start in range(0, len(invoices), INVOICE_CHUNK_SIZE)
+            ),
+            total_paid_by_invoice(payments),
+        )
+    )
+
+    print(f"{'column':<16}{'before MB':>12}{'after MB':>12}  dtype")
+    before_usage = before.memory_usage(deep=True, index=False) / 2**20
+    after_usage = after.memory_usage(deep=True, index=False) / 2**20
+    for column in invoice_columns:
+        print(
+            f"{column:<16}{before_usage[column]:>12.2f}{after_usage[column]:>12.2f}"
+            f"  {before[column].dtype} -> {after[column].dtype}"
+        )
+    print(f"{'total':<16}{megabytes(before):>12.2f}{megabytes(after):>12.2f}")
+    print(
+        f"largest {INVOICE_CHUNK_SIZE}-row chunk held while chunking: "
+        f"{largest_chunk:.2f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
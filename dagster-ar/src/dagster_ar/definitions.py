@@ -2,9 +2,14 @@ import dagster as dg
 
 from dagster_ar.defs.assets import invoices
 from dagster_ar.defs.assets import partitioned_invoices
-from dagster_ar.defs.jobs import daily_update_job, aging_bucket_backfill_job, all_assets_job
-from dagster_ar.defs.schedules import daily_update_schedule
+from dagster_ar.defs.assets import reporting
+from dagster_ar.defs.assets import tenant_invoices
+from dagster_ar.defs.jobs import daily_update_job, aging_bucket_shared_job, aging_bucket_backfill_job, aging_bucket_payments_job, nightly_aging_job, tenant_ingestion_job, aging_summary_job
+from dagster_ar.defs.schedules import daily_update_schedule, nightly_aging_schedule, tenant_ingestion_schedule
+from dagster_ar.defs.sensors import aging_summary_sensor
 from dagster_ar.defs.resources.database import DatabaseResource
+from dagster_ar.defs.resources.landing import LandingZoneResource
+from dagster_ar.defs.resources.parquet import ParquetIOManager
 from dagster_ar.defs.resources.unified import UnifiedAccountingResource
 
 postgres_resource_instance = DatabaseResource(
@@ -21,17 +26,38 @@ unified_api_instance = UnifiedAccountingResource(
     api_key=dg.EnvVar("UNIFIED_API_KEY"),
 )
 
-all_assets = dg.load_assets_from_modules(modules=[invoices, partitioned_invoices])
+all_assets = [
+    *dg.load_assets_from_modules(modules=[invoices, reporting]),
+    *dg.load_assets_from_modules(
+        modules=[partitioned_invoices], group_name="aging_buckets"
+    ),
+    *dg.load_assets_from_modules(modules=[tenant_invoices], group_name="tenants"),
+]
 
 
 @dg.definitions
 def defs():
     return dg.Definitions(
         assets=all_assets,
-        jobs=[daily_update_job, aging_bucket_backfill_job, all_assets_job],
-        schedules=[daily_update_schedule],
+        jobs=[
+            daily_update_job,
+            aging_bucket_shared_job,
+            aging_bucket_backfill_job,
+            aging_bucket_payments_job,
+            nightly_aging_job,
+            tenant_ingestion_job,
+            aging_summary_job,
+        ],
+        schedules=[
+            daily_update_schedule,
+            nightly_aging_schedule,
+            tenant_ingestion_schedule,
+        ],
+        sensors=[aging_summary_sensor],
         resources={
             "database": postgres_resource_instance,
             "unified_api": unified_api_instance,
+            "parquet_io_manager": ParquetIOManager(),
+            "landing": LandingZoneResource(),
         },
     )
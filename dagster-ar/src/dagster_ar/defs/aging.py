@@ -0,0 +1,79 @@
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Inclusive upper bound, in days overdue, of every aging bucket but the last.
+# Bucket 0 is Current (not overdue), 1 is 1-30 days, 2 is 31-60, 3 is 61-90,
+# 4 is 91-120 and 5 is everything over 120 days.
+AGING_BUCKET_EDGES: tuple[int, ...] = (0, 30, 60, 90, 120)
+
+
+def classify_days_overdue(
+    days_overdue: pd.Series | Sequence[float] | np.ndarray,
+    edges: Sequence[int] = AGING_BUCKET_EDGES,
+) -> np.ndarray:
+    """
+    Vectorised aging bucket classification.
+
+    A value falls in bucket `i` when `edges[i - 1] < days <= edges[i]`; values
+    at or below `edges[0]` and missing values are Current (bucket 0), and
+    values above `edges[-1]` land in the last bucket.
+    """
+    days = pd.to_numeric(pd.Series(days_overdue), errors="coerce").to_numpy(
+        dtype="float64", na_value=np.nan
+    )
+
+    # The bucket index is the number of edges a value lies strictly above;
+    # NaN compares False against every edge and so stays Current.
+    buckets = np.zeros(days.shape, dtype="int64")
+    for edge in edges:
+        buckets += days > edge
+
+    return buckets
+
+
+def days_overdue_since(due_at: pd.Series, today: pd.Timestamp) -> pd.Series:
+    """
+    Whole days each `due_at` lies before `today`, never negative. Missing or
+    unparseable due dates count as 0 days overdue.
+    """
+    due_at = pd.to_datetime(due_at, errors="coerce", utc=True)
+    return (today - due_at).dt.days.fillna(0).clip(lower=0)
+
+
+def classify_day(
+    days_overdue: float | None, edges: Sequence[int] = AGING_BUCKET_EDGES
+) -> int:
+    """Classifies a single days-overdue value; see `classify_days_overdue`."""
+    return int(classify_days_overdue([days_overdue], edges)[0])
+
+
+def bucket_day_ranges(
+    edges: Sequence[int] = AGING_BUCKET_EDGES,
+) -> dict[int, tuple[int, int | None]]:
+    """
+    Maps every bucket to its inclusive (min_days, max_days) range. The last
+    bucket has no upper limit, so its max_days is None.
+    """
+    ranges: dict[int, tuple[int, int | None]] = {0: (edges[0], edges[0])}
+
+    for bucket in range(1, len(edges)):
+        ranges[bucket] = (edges[bucket - 1] + 1, edges[bucket])
+
+    ranges[len(edges)] = (edges[-1] + 1, None)
+    return ranges
+
+
+def aging_bucket_sql(
+    days_overdue: str, edges: Sequence[int] = AGING_BUCKET_EDGES
+) -> str:
+    """
+    SQL `CASE` expression bucketing the `days_overdue` SQL expression exactly
+    like `classify_days_overdue`, for recomputing buckets inside Postgres.
+    """
+    whens = " ".join(
+        f"WHEN {days_overdue} <= {edge} THEN {bucket}"
+        for bucket, edge in enumerate(edges)
+    )
+    return f"CASE {whens} ELSE {len(edges)} END"
@@ -0,0 +1,240 @@
+from functools import partial
+from typing import Callable
+
+import dagster as dg
+import pandas as pd
+
+from common.db.customers import customers_columns
+from common.db.invoices import invoice_source_columns
+from common.db.payments import payment_summary_columns, payments_columns
+from common.types.records import ContactRecord, InvoiceRecord, PaymentRecord
+from dagster_ar.defs.daily_partitions import extract_daily_partition
+from dagster_ar.defs.landing import ReplayConfig
+from dagster_ar.defs.loaders import (
+    upsert_customers,
+    upsert_invoices,
+    upsert_payments,
+)
+from dagster_ar.defs.resources.database import DATABASE_TAGS, DatabaseResource
+from dagster_ar.defs.resources.landing import LandingZoneResource
+from dagster_ar.defs.resources.parquet import CHUNK_SIZE, COLUMNS
+from dagster_ar.defs.resources.unified import UnifiedAccountingResource
+from dagster_ar.defs.transforms import (
+    INVOICE_CHUNK_SIZE,
+    age_invoice_chunks,
+    total_paid_by_invoice,
+)
+
+# Maps a run to the connection ID its partition reads and the date of its day
+PartitionTenantAndDay = Callable[
+    [dg.AssetExecutionContext, UnifiedAccountingResource], tuple[str, str]
+]
+
+
+def build_ingestion_assets(
+    partitions_def: dg.PartitionsDefinition,
+    tenant_and_day: PartitionTenantAndDay,
+    suffix: str = "",
+) -> list[dg.AssetsDefinition]:
+    """
+    Builds the extract, transform and load assets of the customers, invoices
+    and payments a connection updated on a day, partitioned by
+    `partitions_def`. `tenant_and_day` gives the connection ID and date a run
+    reads, and `suffix` is appended to every asset key and staging table.
+
+    Each partition is loaded in order: customers, then invoices, then the
+    payments linking to them.
+    """
+    invoices_staging_table_name = f"invoices_staging{suffix}"
+    payments_staging_table_name = f"payments_staging{suffix}"
+
+    def extract(object_type: str, record_type: type, iter_pages_name: str):
+        @dg.asset(
+            name=f"extract_{object_type}{suffix}",
+            partitions_def=partitions_def,
+            io_manager_key="parquet_io_manager",
+            description=(
+                f"Fetches the {object_type} of the partition's connection updated "
+                "on the partition's day from the Unified Accounting endpoint, "
+                f"landing the raw records, or replays a day of landed {object_type}."
+            ),
+        )
+        def extract_asset(
+            context: dg.AssetExecutionContext,
+            config: ReplayConfig,
+            unified_api: UnifiedAccountingResource,
+            landing: LandingZoneResource,
+        ):
+            tenant, day = tenant_and_day(context, unified_api)
+            return extract_daily_partition(
+                context,
+                config,
+                landing,
+                object_type,
+                partial(getattr(unified_api, iter_pages_name), conn_id=tenant),
+                record_type,
+                tenant,
+                day,
+            )
+
+        return extract_asset
+
+    @dg.asset(
+        name=f"transform_customers{suffix}",
+        partitions_def=partitions_def,
+        ins={"customers": dg.AssetIn(f"extract_customers{suffix}")},
+        io_manager_key="parquet_io_manager",
+    )
+    def transform_customers(customers: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transforms raw customer data to the columns loaded into Postgres.
+        """
+        if customers.empty:
+            return pd.DataFrame(columns=customers_columns)
+
+        return customers[customers_columns]
+
+    @dg.asset(
+        name=f"load_customers{suffix}",
+        partitions_def=partitions_def,
+        ins={"customers": dg.AssetIn(f"transform_customers{suffix}")},
+        op_tags=DATABASE_TAGS,
+    )
+    def load_customers(
+        context: dg.AssetExecutionContext,
+        database: DatabaseResource,
+        customers: pd.DataFrame,
+    ) -> None:
+        """
+        Loads customers into Postgres, ahead of the partition's invoices.
+        Updates existing rows only if current names are not '[Unknown Customer]' / '[Unknown Company]'.
+        """
+        if customers.empty:
+            context.log.info(f"No customers to load for partition {context.partition_key}")
+            return
+
+        with database.get_transaction() as conn:
+            upsert_customers(database, conn, customers)
+
+        context.log.info(
+            f"Loaded {len(customers)} customers for partition {context.partition_key}"
+        )
+
+    @dg.asset(
+        name=f"transform_invoices{suffix}",
+        partitions_def=partitions_def,
+        ins={
+            "invoices": dg.AssetIn(
+                f"extract_invoices{suffix}",
+                metadata={
+                    CHUNK_SIZE: INVOICE_CHUNK_SIZE,
+                    COLUMNS: list(invoice_source_columns),
+                },
+            ),
+            "payments": dg.AssetIn(
+                f"transform_payments{suffix}",
+                metadata={COLUMNS: payment_summary_columns},
+            ),
+        },
+        io_manager_key="parquet_io_manager",
+    )
+    def transform_invoices(invoices, payments: pd.DataFrame):
+        """
+        Ages the extracted invoices in chunks of `INVOICE_CHUNK_SIZE` against the
+        total paid per invoice. The aged chunks are produced lazily and written
+        one at a time, so the whole ledger is never held in memory.
+
+        The day's payments only net what was paid that day; the invoice load
+        recomputes each balance from every stored payment.
+        """
+        # Wrapped in an Output so Dagster hands the generator to the IO manager
+        # instead of iterating it as a stream of events.
+        return dg.Output(
+            age_invoice_chunks(invoices, total_paid_by_invoice(payments))
+        )
+
+    @dg.asset(
+        name=f"load_invoices{suffix}",
+        partitions_def=partitions_def,
+        ins={
+            "aging_data": dg.AssetIn(
+                f"transform_invoices{suffix}", metadata={CHUNK_SIZE: INVOICE_CHUNK_SIZE}
+            )
+        },
+        deps=[f"load_customers{suffix}"],
+        op_tags=DATABASE_TAGS,
+    )
+    def load_invoices(
+        context: dg.AssetExecutionContext, database: DatabaseResource, aging_data
+    ) -> None:
+        """
+        Loads and UPSERTs (Update or Insert) the AR aging data by COPYing it,
+        chunk by chunk, into a temporary staging table, in a single
+        transaction. Ensures missing customers are inserted as placeholders.
+        """
+        with database.get_transaction() as conn:
+            loaded = upsert_invoices(
+                database, conn, aging_data, invoices_staging_table_name
+            )
+
+        context.log.info(f"Loaded {loaded} invoices for partition {context.partition_key}")
+
+    @dg.asset(
+        name=f"transform_payments{suffix}",
+        partitions_def=partitions_def,
+        ins={"payments": dg.AssetIn(f"extract_payments{suffix}")},
+        io_manager_key="parquet_io_manager",
+    )
+    def transform_payments(payments: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transforms raw payment data to the columns loaded into Postgres.
+        """
+        if payments.empty:
+            return pd.DataFrame(columns=payments_columns).rename(
+                columns={"id": "payment_id", "contact_id": "customer_id"}
+            )
+
+        return payments[payments_columns].rename(
+            columns={"id": "payment_id", "contact_id": "customer_id"}
+        )
+
+    @dg.asset(
+        name=f"load_payments{suffix}",
+        partitions_def=partitions_def,
+        ins={"payments": dg.AssetIn(f"transform_payments{suffix}")},
+        deps=[f"load_invoices{suffix}"],
+        op_tags=DATABASE_TAGS,
+    )
+    def load_payments(
+        context: dg.AssetExecutionContext,
+        database: DatabaseResource,
+        payments: pd.DataFrame,
+    ) -> None:
+        """
+        Merges the extracted payments into the Postgres `payments` table once
+        the partition's invoices are loaded, so each payment links to its
+        invoice, then refreshes the outstanding balance of every invoice those
+        payments touch.
+        """
+        if payments.empty:
+            context.log.info(f"No payments to load for partition {context.partition_key}")
+            return
+
+        with database.get_transaction() as conn:
+            upsert_payments(database, conn, payments, payments_staging_table_name)
+
+        context.log.info(
+            f"Loaded {len(payments)} payments for partition {context.partition_key}"
+        )
+
+    return [
+        extract("customers", ContactRecord, "iter_customer_pages"),
+        transform_customers,
+        load_customers,
+        extract("invoices", InvoiceRecord, "iter_invoice_pages"),
+        extract("payments", PaymentRecord, "iter_payment_pages"),
+        transform_invoices,
+        load_invoices,
+        transform_payments,
+        load_payments,
+    ]
@@ -1,37 +1,39 @@
-import math
-from sqlalchemy import text
 import dagster as dg
 import pandas as pd
-from uuid import UUID
 from datetime import datetime, timedelta
-
-from common.db.invoices import invoice_columns
-from common.db.payments import payments_columns
-from dagster_ar.defs.resources.database import DatabaseResource
+from typing import Any, Iterable, Iterator, Sequence
+
+from common.db.invoices import invoice_source_columns
+from common.db.payments import payment_summary_columns, payments_columns
+from dagster_ar.defs.aging import classify_days_overdue, days_overdue_since
+from dagster_ar.defs.landing import ReplayConfig, extract_frame
+from dagster_ar.defs.loaders import (
+    upsert_customers,
+    upsert_invoices,
+    upsert_payments,
+)
+from dagster_ar.defs.resources.database import DATABASE_TAGS, DatabaseResource
+from dagster_ar.defs.resources.landing import LandingZoneResource
+from dagster_ar.defs.resources.parquet import CHUNK_SIZE, COLUMNS, PartitionedFrames
 from dagster_ar.defs.resources.unified import UnifiedAccountingResource
+from dagster_ar.defs.transforms import (
+    INVOICE_CHUNK_SIZE,
+    age_invoice_chunks,
+    total_paid_by_invoice,
+)
 from common.db.customers import customers_columns
+from common.types.records import ContactRecord, InvoiceRecord, PaymentRecord
 from dagster_ar.defs.partitions import (
     aging_bucket_partitions,
     get_days_range_for_partition,
 )
 
 
-def categorize(days):
-    """Categorize days overdue into aging buckets."""
-    if pd.isna(days):
-        return 0
-    elif days <= 0:
-        return 0
-    elif days <= 30:
-        return 1
-    elif days <= 60:
-        return 2
-    elif days <= 90:
-        return 3
-    elif days <= 120:
-        return 4
-    else:
-        return 5
+payments_staging_table_name = "payments_staging_backfill"
+
+# Label of the customers and payments landed for the bucket backfill, so a
+# replay reads those rather than a daily partition's files
+shared_label = "backfill"
 
 
 def get_aging_bucket_filter(partition_key: str) -> dict:
@@ -41,23 +43,23 @@ def get_aging_bucket_filter(partition_key: str) -> dict:
     # Calculate date range for the aging bucket
     today = datetime.now()
 
-    if partition_key == "0":  # Current
+    if max_days == 0:  # Current
         # Current: due date is today or in the future
         return {
             "due_date_from": today.strftime("%Y-%m-%d"),
             "due_date_to": (today + timedelta(days=365)).strftime(
                 "%Y-%m-%d"
             ),  # Future invoices
-            "min_days": 0,
-            "max_days": 0,
+            "min_days": min_days,
+            "max_days": max_days,
         }
-    elif partition_key == "5":  # 120+ days
-        # 120+ days: due date is more than 120 days ago
-        due_date_cutoff = today - timedelta(days=120)
+    elif max_days is None:  # Oldest bucket, e.g. 120+ days
+        # Due date is before the start of the oldest bucket
+        due_date_cutoff = today - timedelta(days=min_days - 1)
         return {
             "due_date_from": "1900-01-01",  # Very old date
             "due_date_to": due_date_cutoff.strftime("%Y-%m-%d"),
-            "min_days": 121,
+            "min_days": min_days,
             "max_days": None,
         }
     else:
@@ -72,358 +74,301 @@ def get_aging_bucket_filter(partition_key: str) -> dict:
         }
 
 
-@dg.asset(partitions_def=aging_bucket_partitions)
-def extract_customers_partitioned(context, unified_api: UnifiedAccountingResource):
+def by_partition(context, value) -> dict[str, Any]:
+    """
+    Maps each of the run's partition keys to its part of a partitioned input.
+    IO managers hand over a single partition as-is, and several as a dict
+    keyed by partition key.
+    """
+    if len(context.partition_keys) == 1:
+        return {context.partition_key: value}
+    return value
+
+
+def split_by_aging_bucket(
+    invoices: pd.DataFrame, partition_keys: Sequence[str]
+) -> dict[str, pd.DataFrame]:
     """
-    Fetches customers for a specific aging bucket partition.
+    Slices extracted invoices into the given aging bucket partitions,
+    classifying every invoice's due date in one vectorised pass.
     """
-    partition_key = context.partition_key
+    today = pd.Timestamp.now(tz="UTC")
+    buckets = classify_days_overdue(days_overdue_since(invoices["due_at"], today))
+
+    return {
+        key: invoices[buckets == int(key)].reset_index(drop=True)
+        for key in partition_keys
+    }
 
-    data = unified_api.get_customers(params={"env": "Sandbox", "limit": 50})
 
-    context.log.info(f"Extracted {len(data)} customers for partition {partition_key}")
-    return data
+def iter_aging_buckets(
+    context, frames: Iterable[pd.DataFrame], aging_filters: dict[str, dict]
+) -> Iterator[dict[str, pd.DataFrame]]:
+    """
+    Lazily splits each extracted frame into the aging buckets keyed in
+    `aging_filters`, logging how many invoices every bucket got once the
+    frames run out.
+    """
+    partition_keys = list(aging_filters)
+    counts = dict.fromkeys(partition_keys, 0)
+
+    for frame in frames:
+        buckets = split_by_aging_bucket(frame, partition_keys)
+        for partition_key, bucket in buckets.items():
+            counts[partition_key] += len(bucket)
+        yield buckets
+
+    for partition_key, aging_filter in aging_filters.items():
+        context.log.info(
+            f"Extracted {counts[partition_key]} invoices for partition {partition_key} "
+            f"(due_date: {aging_filter['due_date_from']} to "
+            f"{aging_filter['due_date_to']})"
+        )
+
+
+# Customers and payments are not bucketed, so the backfill fetches, transforms
+# and loads them once per run; every bucket partition downstream reads the
+# same materialization instead of calling the API again.
+@dg.asset(io_manager_key="parquet_io_manager")
+def extract_customers_partitioned(
+    context,
+    config: ReplayConfig,
+    unified_api: UnifiedAccountingResource,
+    landing: LandingZoneResource,
+):
+    """
+    Fetches every customer once for the aging bucket backfill, writing them
+    out a page at a time.
+    """
+    pages = unified_api.iter_customer_pages(params={"env": "Sandbox"})
+    frames = extract_frame(
+        context,
+        config,
+        landing,
+        "customers",
+        pages,
+        ContactRecord,
+        unified_api.conn_id,
+        label=shared_label,
+    )
+
+    # Wrapped in an Output so Dagster hands the generator to the IO manager
+    # instead of iterating it as a stream of events.
+    return dg.Output(frames)
 
 
 @dg.asset(
-    partitions_def=aging_bucket_partitions,
     ins={"customers": dg.AssetIn("extract_customers_partitioned")},
+    io_manager_key="parquet_io_manager",
 )
-def transform_customers_partitioned(context, customers: list) -> pd.DataFrame:
+def transform_customers_partitioned(context, customers: pd.DataFrame) -> pd.DataFrame:
     """
-    Transforms raw customer data for a specific aging bucket partition.
+    Transforms raw customer data for the aging bucket backfill.
     """
-    df = pd.DataFrame(customers)
-    customer_copy = df.copy()
-    customers_df = customer_copy[customers_columns]
+    if customers.empty:
+        return pd.DataFrame(columns=customers_columns)
 
-    context.log.info(
-        f"Transformed {len(customers_df)} customers for partition {context.partition_key}"
-    )
+    customers_df = customers[customers_columns]
+
+    context.log.info(f"Transformed {len(customers_df)} customers for the bucket backfill")
     return customers_df
 
 
 @dg.asset(
-    partitions_def=aging_bucket_partitions,
     ins={"customers": dg.AssetIn("transform_customers_partitioned")},
+    op_tags=DATABASE_TAGS,
 )
 def load_customers_partitioned(
     context, database: DatabaseResource, customers: pd.DataFrame
 ) -> None:
     """
-    Loads customers for a specific aging bucket partition.
+    Loads the backfill's customers once, ahead of every bucket's invoices.
     """
     if customers.empty:
-        context.log.info(f"No customers to load for partition {context.partition_key}")
+        context.log.info("No customers to load for the bucket backfill")
         return
 
     with database.get_transaction() as conn:
-        # UPSERT each customer
-        insert_sql = text("""
-          INSERT INTO customers (
-              id, name, company_name, is_active, is_supplier, created_at, updated_at
-          ) VALUES (
-              :id, :name, :company_name, :is_active, :is_supplier, NOW(), NOW()
-          )
-          ON CONFLICT (id) DO UPDATE
-          SET
-              name = EXCLUDED.name,
-              company_name = EXCLUDED.company_name,
-              is_active = EXCLUDED.is_active,
-              is_supplier = EXCLUDED.is_supplier,
-              updated_at = NOW()
-          WHERE customers.name = '[Unknown Customer]'
-            OR customers.company_name = '[Unknown Company]';
-      """)
-
-        for _, row in customers.iterrows():
-            # Safely convert is_supplier to boolean
-            is_supplier = row.get("is_supplier", False)
-            if is_supplier is None or (
-                isinstance(is_supplier, float) and math.isnan(is_supplier)
-            ):
-                is_supplier = False
-            else:
-                is_supplier = bool(is_supplier)
-
-            conn.execute(
-                insert_sql,
-                {
-                    "id": UUID(str(row["id"])),
-                    "name": row["name"],
-                    "company_name": row.get("company_name", ""),
-                    "is_active": bool(row.get("is_active", True)),
-                    "is_supplier": is_supplier,
-                },
-            )
-
-    context.log.info(
-        f"Loaded {len(customers)} customers for partition {context.partition_key}"
-    )
+        upsert_customers(database, conn, customers)
 
+    context.log.info(f"Loaded {len(customers)} customers for the bucket backfill")
 
-@dg.asset(partitions_def=aging_bucket_partitions, deps=["load_customers_partitioned"])
-def extract_invoices_partitioned(context, unified_api: UnifiedAccountingResource):
+
+@dg.asset(
+    partitions_def=aging_bucket_partitions,
+    io_manager_key="parquet_io_manager",
+    backfill_policy=dg.BackfillPolicy.single_run(),
+)
+def extract_invoices_partitioned(
+    context,
+    config: ReplayConfig,
+    unified_api: UnifiedAccountingResource,
+    landing: LandingZoneResource,
+) -> PartitionedFrames:
     """
-    Fetches invoices for a specific aging bucket partition based on due date range.
+    Fetches invoices for the run's aging bucket partitions with a single API
+    listing over their combined due date range, slicing each page into the
+    buckets as it arrives. Each slice is written to its bucket's file before
+    the next page is read, so only one page is held in memory.
     """
-    partition_key = context.partition_key
-    aging_filter = get_aging_bucket_filter(partition_key)
+    partition_keys = context.partition_keys
+    aging_filters = {key: get_aging_bucket_filter(key) for key in partition_keys}
 
     # Build params for the API call
     params = {
         "env": "Sandbox",
-        "limit": 50,
-        "due_date_from": aging_filter["due_date_from"],
-        "due_date_to": aging_filter["due_date_to"],
+        "due_date_from": min(f["due_date_from"] for f in aging_filters.values()),
+        "due_date_to": max(f["due_date_to"] for f in aging_filters.values()),
     }
 
-    data = unified_api.get_invoices(params=params)
-
-    context.log.info(
-        f"Extracted {len(data)} invoices for partition {partition_key} "
-        f"(due_date: {aging_filter['due_date_from']} to {aging_filter['due_date_to']})"
+    # A replay reads back exactly what a run over these buckets landed, and
+    # fails if no such run landed anything that day.
+    label = f"bucket_{'_'.join(partition_keys)}"
+
+    pages = unified_api.iter_invoice_pages(params=params)
+    frames = extract_frame(
+        context,
+        config,
+        landing,
+        "invoices",
+        pages,
+        InvoiceRecord,
+        unified_api.conn_id,
+        label=label,
     )
-    return data
 
+    return PartitionedFrames(iter_aging_buckets(context, frames, aging_filters))
 
-@dg.asset(partitions_def=aging_bucket_partitions)
-def extract_payments_partitioned(context, unified_api: UnifiedAccountingResource):
+
+@dg.asset(io_manager_key="parquet_io_manager")
+def extract_payments_partitioned(
+    context,
+    config: ReplayConfig,
+    unified_api: UnifiedAccountingResource,
+    landing: LandingZoneResource,
+):
     """
-    Fetches payments for a specific aging bucket partition.
+    Fetches every payment once for the aging bucket backfill, writing them
+    out a page at a time. Payments have no due date, so each bucket partition
+    matches them to its invoices instead.
     """
-    partition_key = context.partition_key
-    aging_filter = get_aging_bucket_filter(partition_key)
-
-    # Build params for the API call
-    params = {
-        "env": "Sandbox",
-        "limit": 50,
-        "due_date_from": aging_filter["due_date_from"],
-        "due_date_to": aging_filter["due_date_to"],
-    }
-
-    data = unified_api.get_payments(params=params)
+    pages = unified_api.iter_payment_pages(params={"env": "Sandbox"})
+    frames = extract_frame(
+        context,
+        config,
+        landing,
+        "payments",
+        pages,
+        PaymentRecord,
+        unified_api.conn_id,
+        label=shared_label,
+    )
 
-    context.log.info(f"Extracted {len(data)} payments for partition {partition_key}")
-    return data
+    # Wrapped in an Output so Dagster hands the generator to the IO manager
+    # instead of iterating it as a stream of events.
+    return dg.Output(frames)
 
 
 @dg.asset(
     partitions_def=aging_bucket_partitions,
     ins={
-        "invoices": dg.AssetIn("extract_invoices_partitioned"),
-        "payments": dg.AssetIn("extract_payments_partitioned"),
+        "invoices": dg.AssetIn(
+            "extract_invoices_partitioned",
+            metadata={
+                CHUNK_SIZE: INVOICE_CHUNK_SIZE,
+                COLUMNS: list(invoice_source_columns),
+            },
+        ),
+        "payments": dg.AssetIn(
+            "transform_payments_partitioned",
+            metadata={COLUMNS: payment_summary_columns},
+        ),
     },
+    io_manager_key="parquet_io_manager",
+    backfill_policy=dg.BackfillPolicy.single_run(),
 )
 def transform_invoices_partitioned(
-    context, invoices: list, payments: list
-) -> pd.DataFrame:
+    context, invoices, payments: pd.DataFrame
+) -> dict:
     """
-    Transforms invoices and payments for a specific aging bucket partition.
+    Ages each of the run's aging bucket partitions chunk by chunk, keeping
+    only the invoices that still fall in that bucket. Payments are summed
+    once for every partition.
     """
-    partition_key = context.partition_key
-
-    if not invoices:
-        context.log.info(f"No invoices to transform for partition {partition_key}")
-        return pd.DataFrame()
+    total_paid = total_paid_by_invoice(payments)
 
-    invoices_df = pd.DataFrame(invoices)
-    invoices_df["invoice_at"] = pd.to_datetime(
-        invoices_df["invoice_at"], errors="coerce", utc=True
-    )
-
-    payments_df = pd.DataFrame(payments)
-    payments_summary = (
-        payments_df.groupby("invoice_id")["total_amount"]
-        .sum()
-        .reset_index(name="total_paid")
-    )
-
-    merged = invoices_df.merge(
-        payments_summary, how="left", left_on="id", right_on="invoice_id"
-    )
-
-    merged = merged.drop(columns=["invoice_id"])
-    merged["total_paid"] = merged["total_paid"].fillna(0)
-    merged["balance_amount"] = merged["total_amount"] - merged["total_paid"]
-    merged["due_at"] = pd.to_datetime(merged["due_at"], errors="coerce", utc=True)
-    today = pd.Timestamp.now(tz="UTC")
-    merged["days_overdue"] = (today - merged["due_at"]).dt.days
-    merged["days_overdue"] = merged["days_overdue"].fillna(0).clip(lower=0)
-    merged["aging_bucket"] = merged["days_overdue"].apply(categorize)
-
-    # Filter to only include records that match this partition's aging bucket
-    aging_filter = get_aging_bucket_filter(partition_key)
-    min_days, max_days = aging_filter["min_days"], aging_filter["max_days"]
-
-    if partition_key == "0":  # Current
-        # Current: days_overdue should be 0 or negative
-        filtered_merged = merged[merged["days_overdue"] <= 0]
-    elif partition_key == "5":  # 120+ days
-        # 120+ days: days_overdue should be > 120
-        filtered_merged = merged[merged["days_overdue"] > 120]
-    else:
-        # Specific ranges: days_overdue should be within the range
-        if max_days is not None:
-            filtered_merged = merged[
-                (merged["days_overdue"] >= min_days)
-                & (merged["days_overdue"] <= max_days)
-            ]
-        else:
-            filtered_merged = merged[merged["days_overdue"] >= min_days]
-
-    ar_aging_df = filtered_merged.rename(
-        columns={
-            "id": "invoice_id",
-            "contact_id": "customer_id",
-        }
-    )
-
-    result_df = ar_aging_df[invoice_columns]
-    context.log.info(
-        f"Transformed {len(result_df)} invoices for partition {partition_key}"
-    )
-    return result_df
+    return {
+        partition_key: age_invoice_chunks(
+            chunks, total_paid, aging_bucket=int(partition_key)
+        )
+        for partition_key, chunks in by_partition(context, invoices).items()
+    }
 
 
 @dg.asset(
     partitions_def=aging_bucket_partitions,
-    ins={"aging_data": dg.AssetIn("transform_invoices_partitioned")},
+    ins={
+        "aging_data": dg.AssetIn(
+            "transform_invoices_partitioned",
+            metadata={CHUNK_SIZE: INVOICE_CHUNK_SIZE},
+        )
+    },
+    deps=["load_customers_partitioned"],
+    op_tags=DATABASE_TAGS,
+    backfill_policy=dg.BackfillPolicy.single_run(),
 )
-def load_invoices_partitioned(
-    context, database: DatabaseResource, aging_data: pd.DataFrame
-) -> None:
+def load_invoices_partitioned(context, database: DatabaseResource, aging_data) -> None:
     """
-    Loads invoices for a specific aging bucket partition.
+    Loads invoices for each of the run's aging bucket partitions, one
+    transaction per bucket.
     """
-    partition_key = context.partition_key
-
-    if aging_data.empty:
-        context.log.info(f"No invoice data to load for partition {partition_key}")
-        return
+    for partition_key, chunks in by_partition(context, aging_data).items():
+        staging_table_name = f"invoices_staging_bucket_{partition_key}"
 
-    aging_data = aging_data.copy()
-    staging_table_name = f"invoices_staging_bucket_{partition_key}"
+        with database.get_transaction() as conn:
+            loaded = upsert_invoices(database, conn, chunks, staging_table_name)
 
-    invoice_update_columns = [
-        "customer_id",
-        "invoice_number",
-        "invoice_at",
-        "due_at",
-        "currency",
-        "days_overdue",
-        "aging_bucket",
-    ]
-
-    with database.get_transaction() as conn:
-        aging_data.to_sql(
-            staging_table_name,
-            con=conn,
-            if_exists="replace",
-            index=False,
-        )
-
-        customer_ids = aging_data["customer_id"].dropna().unique().tolist()
-
-        if customer_ids:
-            params = {f"id_{i}": str(cid) for i, cid in enumerate(customer_ids)}
-            placeholders = ", ".join(f":id_{i}" for i in range(len(customer_ids)))
-
-            existing_query = text(f"""
-                SELECT id
-                FROM customers
-                WHERE id IN ({placeholders})
-            """)
-
-            existing_ids = {
-                row[0] for row in conn.execute(existing_query, params).fetchall()
-            }
-            missing_ids = [cid for cid in customer_ids if cid not in existing_ids]
-        else:
-            missing_ids = []
-
-        if missing_ids:
-            insert_sql = text("""
-                INSERT INTO customers (
-                    id, name, company_name, is_active, is_supplier, created_at, updated_at
-                )
-                VALUES (
-                    :id, '[Unknown Customer]', '[Unknown Company]', TRUE, FALSE, NOW(), NOW()
-                )
-                ON CONFLICT (id) DO NOTHING;
-            """)
-            for cid in missing_ids:
-                conn.execute(insert_sql, {"id": UUID(str(cid))})
-
-        set_clause = ", ".join(
-            [f"{col} = EXCLUDED.{col}" for col in invoice_update_columns]
-        )
-
-        upsert_sql = text(f"""
-            INSERT INTO invoices (
-                invoice_id, customer_id, invoice_number, currency,
-                total_amount, balance_amount, tax_amount,
-                invoice_at, due_at, days_overdue, aging_bucket,
-                status, type, notes, posted_at, paid_amount,
-                created_at, updated_at
-            )
-            SELECT
-                invoice_id::uuid, customer_id::uuid, invoice_number, currency,
-                total_amount, balance_amount, tax_amount,
-                invoice_at::timestamptz, due_at::timestamptz, days_overdue,
-                aging_bucket, status, type, notes, posted_at::timestamptz,
-                paid_amount, NOW(), NOW()
-            FROM {staging_table_name}
-            ON CONFLICT (invoice_id) DO UPDATE SET
-                {set_clause};
-        """)
-
-        conn.execute(upsert_sql)
-
-    context.log.info(f"Loaded {len(aging_data)} invoices for partition {partition_key}")
+        context.log.info(f"Loaded {loaded} invoices for partition {partition_key}")
 
 
 @dg.asset(
-    partitions_def=aging_bucket_partitions,
     ins={"payments": dg.AssetIn("extract_payments_partitioned")},
+    io_manager_key="parquet_io_manager",
 )
-def transform_payments_partitioned(context, payments: list):
+def transform_payments_partitioned(context, payments: pd.DataFrame):
     """
-    Transforms payment data for a specific aging bucket partition.
+    Transforms payment data for the aging bucket backfill.
     """
-    partition_key = context.partition_key
+    if payments.empty:
+        return pd.DataFrame(columns=payments_columns).rename(
+            columns={"id": "payment_id", "contact_id": "customer_id"}
+        )
 
-    df = pd.DataFrame(payments)
-    payments_df_copy = df.copy()
-    payments_df = payments_df_copy[payments_columns].rename(
+    payments_df = payments[payments_columns].rename(
         columns={"id": "payment_id", "contact_id": "customer_id"}
     )
 
-    context.log.info(
-        f"Transformed {len(payments_df)} payments for partition {partition_key}"
-    )
+    context.log.info(f"Transformed {len(payments_df)} payments for the bucket backfill")
     return payments_df
 
 
 @dg.asset(
-    partitions_def=aging_bucket_partitions,
     ins={"payments": dg.AssetIn("transform_payments_partitioned")},
+    deps=["load_invoices_partitioned"],
+    op_tags=DATABASE_TAGS,
 )
 def load_payments_partitioned(
     context, database: DatabaseResource, payments: pd.DataFrame
 ) -> None:
     """
-    Loads payments for a specific aging bucket partition.
+    Merges the backfill's payments into the `payments` table once every bucket's
+    invoices are loaded, so each payment links to its invoice.
     """
-    partition_key = context.partition_key
-
     if payments.empty:
-        context.log.info(f"No payments to load for partition {partition_key}")
+        context.log.info("No payments to load for the bucket backfill")
         return
 
-    with database.get_connection() as conn:
-        table_name = f"payments_bucket_{partition_key}"
-        payments.to_sql(table_name, con=conn, if_exists="replace", index=False)
+    with database.get_transaction() as conn:
+        upsert_payments(database, conn, payments, payments_staging_table_name)
 
-    context.log.info(f"Loaded {len(payments)} payments for partition {partition_key}")
+    context.log.info(f"Loaded {len(payments)} payments for the bucket backfill")
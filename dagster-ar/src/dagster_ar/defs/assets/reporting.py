@@ -0,0 +1,110 @@
+from sqlalchemy import text
+import dagster as dg
+
+from dagster_ar.defs.aging import aging_bucket_sql
+from dagster_ar.defs.resources.database import DATABASE_TAGS, DatabaseResource
+
+
+aging_summary_view_name = "ar_aging_summary"
+report_versions_table_name = "report_versions"
+# Report name the dashboard keys its cached aging report on.
+aging_report_name = "ar_aging"
+invoices_table_name = "invoices"
+
+
+@dg.asset(
+    deps=["load_invoices", "load_invoices_partitioned", "load_invoices_by_tenant"],
+    op_tags=DATABASE_TAGS,
+)
+def recompute_invoice_aging(
+    context: dg.AssetExecutionContext, database: DatabaseResource
+) -> None:
+    """
+    Re-ages outstanding invoices against today's date in one set-based UPDATE,
+    so aging buckets stay accurate between API loads.
+
+    Only rows whose aging bucket moves are rewritten; their `days_overdue` is
+    refreshed alongside. Days are counted like `transform_invoices` does:
+    whole days since `due_at`, never negative.
+    """
+    days_overdue = (
+        "GREATEST(FLOOR(EXTRACT(EPOCH FROM (now() - i.due_at)) / 86400), 0)::integer"
+    )
+    update_sql = text(f"""
+        WITH aged AS (
+            SELECT
+                i.invoice_id,
+                {days_overdue} AS days_overdue
+            FROM {invoices_table_name} AS i
+            WHERE i.balance_amount > 0
+        ),
+        bucketed AS (
+            SELECT
+                invoice_id,
+                days_overdue,
+                {aging_bucket_sql("days_overdue")} AS aging_bucket
+            FROM aged
+        )
+        UPDATE {invoices_table_name} AS i
+        SET
+            days_overdue = b.days_overdue,
+            aging_bucket = b.aging_bucket
+        FROM bucketed AS b
+        WHERE i.invoice_id = b.invoice_id
+            AND i.aging_bucket IS DISTINCT FROM b.aging_bucket
+    """)
+
+    with database.get_transaction() as conn:
+        updated = conn.execute(update_sql).rowcount
+
+    context.log.info(f"Moved {updated} invoices to a new aging bucket")
+    context.add_output_metadata({"num_updated": updated})
+
+
+@dg.asset(
+    deps=[
+        "recompute_invoice_aging",
+        "load_invoices",
+        "load_payments",
+        "load_invoices_partitioned",
+        "load_payments_partitioned",
+        "load_invoices_by_tenant",
+        "load_payments_by_tenant",
+    ],
+    op_tags=DATABASE_TAGS,
+)
+def refresh_aging_summary(
+    context: dg.AssetExecutionContext, database: DatabaseResource
+) -> None:
+    """
+    Refreshes the `ar_aging_summary` materialized view (outstanding balance per
+    customer and aging bucket) that backs the dashboard, once the invoice and
+    payment loads have settled.
+
+    The refresh is CONCURRENT, so dashboard reads keep hitting the previous
+    snapshot instead of blocking while it is rebuilt. The report version the
+    dashboard caches on is bumped in the same transaction, so the cache is
+    invalidated exactly when the new snapshot becomes visible.
+    """
+    with database.get_transaction() as conn:
+        conn.execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {aging_summary_view_name}")
+        )
+        customers = conn.execute(
+            text(f"SELECT COUNT(*) FROM {aging_summary_view_name}")
+        ).scalar_one()
+        version = conn.execute(
+            text(f"""
+                INSERT INTO {report_versions_table_name} (name, version, updated_at)
+                VALUES (:name, 1, now())
+                ON CONFLICT (name) DO UPDATE SET
+                    version = {report_versions_table_name}.version + 1,
+                    updated_at = EXCLUDED.updated_at
+                RETURNING version
+            """),
+            {"name": aging_report_name},
+        ).scalar_one()
+
+    context.add_output_metadata(
+        {"num_customers": customers, "report_version": version}
+    )
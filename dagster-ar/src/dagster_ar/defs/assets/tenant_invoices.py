@@ -0,0 +1,22 @@
+import dagster as dg
+
+from dagster_ar.defs.assets.ingestion import build_ingestion_assets
+from dagster_ar.defs.partitions import tenant_daily_partitions
+from dagster_ar.defs.resources.unified import UnifiedAccountingResource
+
+
+# Every partition is one Unified connection ID's day: each run reads that
+# company's records updated on the day through the shared
+# UnifiedAccountingResource and stamps them with the connection as their
+# tenant, so tenants ingest in parallel runs.
+def tenant_and_day(
+    context: dg.AssetExecutionContext, unified_api: UnifiedAccountingResource
+) -> tuple[str, str]:
+    """The connection ID and date of the run's tenant partition."""
+    keys = context.partition_key.keys_by_dimension
+    return keys["tenant"], keys["date"]
+
+
+tenant_assets = build_ingestion_assets(
+    tenant_daily_partitions, tenant_and_day, suffix="_by_tenant"
+)
@@ -1,5 +1,10 @@
+from typing import Callable, Iterable, Iterator, NamedTuple
+
 import dagster as dg
-from datetime import datetime, date
+import pandas as pd
+
+from dagster_ar.defs.landing import ReplayConfig, extract_frame
+from dagster_ar.defs.resources.landing import LandingZoneResource
 
 # Create daily partition definition starting from 2025-01-01
 daily_partition = dg.DailyPartitionsDefinition(
@@ -7,3 +12,163 @@ daily_partition = dg.DailyPartitionsDefinition(
     end_date=None,  # No end date - runs indefinitely
     timezone="UTC"
 )
+
+
+def is_first_partition(window: dg.TimeWindow) -> bool:
+    """
+    Whether `window` is the first daily partition. That partition also holds
+    every record last changed before the partitions start, so backfilling all
+    of a connection's partitions loads its whole ledger.
+    """
+    return window.start <= daily_partition.start
+
+
+def updated_window_params(window: dg.TimeWindow) -> dict[str, str]:
+    """
+    List params restricting an API listing to records updated in `window`,
+    oldest change first so the listing can stop at the window's end (see
+    `until_window_end`).
+    """
+    params = {
+        "updated_lt": window.end.isoformat(),
+        "sort": "updated_at",
+        "order": "asc",
+    }
+    if not is_first_partition(window):
+        params["updated_gte"] = window.start.isoformat()
+    return params
+
+
+def last_changed_at(records: pd.DataFrame) -> pd.Series:
+    """
+    When each record last changed: its `updated_at`, or its `created_at` where
+    `updated_at` is missing or unparseable.
+    """
+    updated_at = pd.to_datetime(
+        records["updated_at"], errors="coerce", utc=True, format="ISO8601"
+    )
+    created_at = pd.to_datetime(
+        records["created_at"], errors="coerce", utc=True, format="ISO8601"
+    )
+    return updated_at.fillna(created_at)
+
+
+def until_window_end(
+    pages: Iterable[list[dict]], window: dg.TimeWindow
+) -> Iterator[list[dict]]:
+    """
+    Passes `pages` through, but stops listing after the first page holding a
+    record that last changed (see `last_changed_at`) at or after the end of
+    `window`, so an endpoint that ignores `updated_lt` is not paged through
+    to the present.
+
+    Stopping early is only safe while the listing comes back in the order
+    `updated_window_params` asks for. Once a record arrives out of order, the
+    rest of the listing is passed through and `within_window` alone keeps
+    the partition to its day.
+    """
+    end = pd.Timestamp(window.end)
+    ordered = True
+    previous = None
+
+    try:
+        for page in pages:
+            yield page
+            if not (ordered and page):
+                continue
+
+            changed_at = last_changed_at(
+                pd.DataFrame.from_records(page, columns=["updated_at", "created_at"])
+            )
+            ordered = changed_at.is_monotonic_increasing and (
+                previous is None or changed_at.iloc[0] >= previous
+            )
+            previous = changed_at.iloc[-1]
+
+            if ordered and previous >= end:
+                return
+    finally:
+        # Cancels any page requests still in flight past the window's end.
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+
+
+def within_window(records: pd.DataFrame, window: dg.TimeWindow) -> pd.DataFrame:
+    """
+    Keeps the records that last changed (see `last_changed_at`) within
+    `window`, so a partition holds exactly its day even when an endpoint
+    ignores `updated_lt`. Records with neither timestamp are dropped.
+    """
+    changed_at = last_changed_at(records)
+    in_window = changed_at < window.end
+    if not is_first_partition(window):
+        in_window &= changed_at >= window.start
+    return records[in_window].reset_index(drop=True)
+
+
+def extract_daily_partition(
+    context: dg.AssetExecutionContext,
+    config: ReplayConfig,
+    landing: LandingZoneResource,
+    object_type: str,
+    iter_pages: Callable[..., Iterable[list[dict]]],
+    record_type: type[NamedTuple],
+    tenant: str,
+    day: str,
+) -> dg.Output:
+    """
+    Lists the `object_type` records updated within the run's daily partition,
+    `day`, landing them labelled with that date, or replays the ones landed
+    for it on `config.replay_date`. `tenant` is the connection ID
+    `iter_pages` reads from.
+
+    The records are returned as an Output of page-sized frames (see
+    `extract_frame`), which the Parquet IO manager writes as they are listed.
+    """
+    window = context.partition_time_window
+    params = {"env": "Sandbox", **updated_window_params(window)}
+
+    frames = extract_frame(
+        context,
+        config,
+        landing,
+        object_type,
+        until_window_end(iter_pages(params=params), window),
+        record_type,
+        tenant,
+        label=day,
+    )
+
+    # Wrapped in an Output so Dagster hands the generator to the IO manager
+    # instead of iterating it as a stream of events.
+    return dg.Output(frames_within_window(context, frames, window, object_type, day))
+
+
+def frames_within_window(
+    context: dg.AssetExecutionContext,
+    frames: Iterable[pd.DataFrame],
+    window: dg.TimeWindow,
+    object_type: str,
+    day: str,
+) -> Iterator[pd.DataFrame]:
+    """
+    Keeps each frame's records `within_window`, logging how many were kept
+    and dropped once the listing is exhausted.
+    """
+    num_listed = num_kept = 0
+    for frame in frames:
+        kept = within_window(frame, window)
+        num_listed += len(frame)
+        num_kept += len(kept)
+        yield kept
+
+    num_dropped = num_listed - num_kept
+    if num_dropped:
+        context.log.warning(
+            f"Dropped {num_dropped} {object_type} changed outside "
+            f"{day} or with no updated_at/created_at"
+        )
+    context.log.info(
+        f"Extracted {num_kept} {object_type} updated on {day}"
+    )
@@ -0,0 +1,40 @@
+import dagster as dg
+
+from dagster_ar.defs.resources.database import DATABASE_TAG_KEY, DATABASE_TAGS
+
+# Default number of database steps allowed to run at once within a run. With
+# the default pool settings each holds at most `DatabaseResource.pool_size`
+# connections.
+DATABASE_CONCURRENCY_LIMIT = 3
+
+
+@dg.configured(
+    dg.multiprocess_executor,
+    config_schema={
+        "max_concurrent": dg.Field(
+            int,
+            default_value=0,
+            description="Steps run at once; 0 runs one per CPU core.",
+        ),
+        "database_concurrency": dg.Field(
+            int,
+            default_value=DATABASE_CONCURRENCY_LIMIT,
+            description="Steps holding a Postgres connection run at once.",
+        ),
+    },
+)
+def parallel_executor(config: dict) -> dict:
+    """
+    Runs steps in parallel processes, capping the steps tagged with
+    `DATABASE_TAGS` so a run cannot exhaust Postgres connections.
+    """
+    return {
+        "max_concurrent": config["max_concurrent"],
+        "tag_concurrency_limits": [
+            {
+                "key": DATABASE_TAG_KEY,
+                "value": DATABASE_TAGS[DATABASE_TAG_KEY],
+                "limit": config["database_concurrency"],
+            }
+        ],
+    }
@@ -0,0 +1,49 @@
+from typing import Any, Iterable, Iterator, NamedTuple, get_args
+
+import pandas as pd
+
+from common.types.records import decode_page
+
+# pandas dtype of each record field type. Every page gets the same dtypes,
+# even when a field is missing from all its records, so the pages of one
+# extract can be written as row groups of a single Parquet schema.
+_FIELD_DTYPES = {
+    str: "string[pyarrow]",
+    float: "float64",
+    bool: "boolean",
+}
+
+
+def record_dtypes(record_type: type[NamedTuple]) -> dict[str, str]:
+    """The pandas dtype of every `record_type` field (see `common.types.records`)."""
+    dtypes = {}
+    for name, annotation in record_type.__annotations__.items():
+        # Fields are Optional[...]; the dtype follows the non-None type.
+        [field_type] = [arg for arg in get_args(annotation) if arg is not type(None)]
+        dtypes[name] = _FIELD_DTYPES[field_type]
+    return dtypes
+
+
+def frames_from_pages(
+    pages: Iterable[list[dict[str, Any]]], record_type: type[NamedTuple]
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily turns each API page into a DataFrame of `record_type` records as it
+    arrives, so neither the raw pages nor the frames built from them pile up
+    in memory: a consumer such as the Parquet IO manager writes each one out
+    before the next page is read.
+
+    Every frame has the `record_dtypes` of `record_type`. A listing with no
+    pages yields one empty frame, so the schema is written either way.
+    """
+    dtypes = record_dtypes(record_type)
+    empty = True
+
+    for page in pages:
+        empty = False
+        yield pd.DataFrame.from_records(
+            decode_page(page, record_type), columns=record_type._fields
+        ).astype(dtypes)
+
+    if empty:
+        yield pd.DataFrame(columns=record_type._fields).astype(dtypes)
@@ -1,6 +1,9 @@
 import dagster as dg
 from dagster_ar.defs.daily_partitions import daily_partition
-from dagster_ar.defs.partitions import aging_bucket_partitions
+from dagster_ar.defs.executors import parallel_executor
+from dagster_ar.defs.partitions import TENANT_TAGS, aging_bucket_partitions, tenant_daily_partitions
+from dagster_ar.defs.resources.database import DATABASE_TAGS
+from dagster_ar.defs.resources.unified import concurrent_extracts_tags
 
 # Asset selections for different job types
 daily_update_assets = dg.AssetSelection.assets(
@@ -15,37 +18,121 @@ daily_update_assets = dg.AssetSelection.assets(
     "load_payments"
 )
 
-aging_bucket_assets = dg.AssetSelection.assets(
+# Not bucketed: fetched and loaded once, then read by every bucket partition
+aging_bucket_shared_assets = dg.AssetSelection.assets(
     "extract_customers_partitioned",
     "transform_customers_partitioned",
     "load_customers_partitioned",
-    "extract_invoices_partitioned",
     "extract_payments_partitioned",
+    "transform_payments_partitioned"
+)
+
+aging_bucket_assets = dg.AssetSelection.assets(
+    "extract_invoices_partitioned",
     "transform_invoices_partitioned",
-    "load_invoices_partitioned",
-    "transform_payments_partitioned",
+    "load_invoices_partitioned"
+)
+
+# Merged once every bucket's invoices are loaded, so each payment links to its invoice
+aging_bucket_payments_assets = dg.AssetSelection.assets(
     "load_payments_partitioned"
 )
 
-# Daily update job - runs every midnight to fetch last 24 hours of data
+tenant_assets = dg.AssetSelection.assets(
+    "extract_customers_by_tenant",
+    "transform_customers_by_tenant",
+    "load_customers_by_tenant",
+    "extract_invoices_by_tenant",
+    "extract_payments_by_tenant",
+    "transform_invoices_by_tenant",
+    "load_invoices_by_tenant",
+    "transform_payments_by_tenant",
+    "load_payments_by_tenant"
+)
+
+nightly_aging_assets = dg.AssetSelection.assets(
+    "recompute_invoice_aging",
+    "refresh_aging_summary"
+)
+
+# The summary view alone, refreshed once a batch of ingestion runs has settled
+aging_summary_assets = dg.AssetSelection.assets(
+    "refresh_aging_summary"
+)
+
+# Daily update job - partitioned by day, so each run fetches the records updated
+# on its partition date and missed days can be backfilled from the UI. Its three
+# extract steps read the connection at once, so each gets a third of its rate.
 daily_update_job = dg.define_asset_job(
     name="daily_update_job",
     partitions_def=daily_partition,
     selection=daily_update_assets,
-    description="Daily job to fetch new invoices, customers, and payments from the last 24 hours"
+    executor_def=parallel_executor,
+    tags=concurrent_extracts_tags(3),
+    description="Daily job to fetch invoices, customers, and payments updated on the partition date"
 )
 
-# Aging bucket backfill job - for backfilling historical data by aging buckets
+# Shared inputs of the aging bucket backfill - run once before backfilling
+# buckets. The customers and payments are extracted at once, sharing the rate.
+aging_bucket_shared_job = dg.define_asset_job(
+    name="aging_bucket_shared_job",
+    selection=aging_bucket_shared_assets,
+    executor_def=parallel_executor,
+    tags=concurrent_extracts_tags(2),
+    description="Job to fetch and load the customers and payments shared by every aging bucket partition"
+)
+
+# Aging bucket backfill job - for backfilling historical data by aging buckets.
+# Run aging_bucket_shared_job first and aging_bucket_payments_job once every
+# bucket is loaded. Backfilling the whole aging_buckets asset group instead runs
+# the shared assets once, then every bucket, then the payment load. The bucket
+# assets use a single-run backfill policy, so a backfill over a range of buckets
+# is one run with one API listing; the run tags let the instance's run queue cap
+# how many such runs (and single-bucket runs) go at once.
 aging_bucket_backfill_job = dg.define_asset_job(
     name="aging_bucket_backfill_job",
     partitions_def=aging_bucket_partitions,
     selection=aging_bucket_assets,
-    description="Job to backfill historical data by aging buckets (Current, 1-30 days, 31-60 days, etc.)"
+    executor_def=parallel_executor,
+    tags=DATABASE_TAGS,
+    description="Job to backfill historical invoices by aging buckets (Current, 1-30 days, 31-60 days, etc.) from the shared customers and payments"
+)
+
+# Payments of the aging bucket backfill - run after aging_bucket_backfill_job has
+# loaded every bucket, to merge the shared payments and recompute the balances
+# of the invoices they touch
+aging_bucket_payments_job = dg.define_asset_job(
+    name="aging_bucket_payments_job",
+    selection=aging_bucket_payments_assets,
+    executor_def=parallel_executor,
+    tags=DATABASE_TAGS,
+    description="Job to merge the aging bucket backfill's payments once every bucket's invoices are loaded"
+)
+
+# Tenant ingestion job - one run per day of a Unified connection ID (a "tenants"
+# dynamic partition), so many companies' ledgers ingest in parallel runs of one
+# code location. The run tags let the instance's run queue cap how many go at
+# once, and split the connection's rate between the run's three extract steps.
+tenant_ingestion_job = dg.define_asset_job(
+    name="tenant_ingestion_job",
+    partitions_def=tenant_daily_partitions,
+    selection=tenant_assets,
+    executor_def=parallel_executor,
+    tags={**TENANT_TAGS, **concurrent_extracts_tags(3)},
+    description="Job to fetch and load the customers, invoices, and payments of one tenant's connection updated on the partition date"
+)
+
+# Nightly aging job - re-ages stored invoices in Postgres without calling the API
+nightly_aging_job = dg.define_asset_job(
+    name="nightly_aging_job",
+    selection=nightly_aging_assets,
+    description="Job to recompute days overdue and aging buckets of outstanding invoices from their due dates"
 )
 
-# Combined job for running all assets (both daily and partitioned)
-all_assets_job = dg.define_asset_job(
-    name="all_assets_job",
-    selection=dg.AssetSelection.all(),
-    description="Job to run all assets (both daily and partitioned)"
+# Aging summary job - refreshes the dashboard's aging summary without loading
+# anything, launched by aging_summary_sensor once ingestion runs have settled
+aging_summary_job = dg.define_asset_job(
+    name="aging_summary_job",
+    selection=aging_summary_assets,
+    description="Job to refresh the aging summary the dashboard reads"
 )
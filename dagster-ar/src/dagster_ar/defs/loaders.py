@@ -0,0 +1,251 @@
+from typing import Iterable
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from common.db.customers import customer_staging_types
+from common.db.invoices import invoice_staging_types, invoice_update_columns
+from common.db.payments import payment_staging_types
+from dagster_ar.defs.resources.database import DatabaseResource
+
+customers_staging_table_name = "customers_staging"
+invoices_table_name = "invoices"
+
+
+def upsert_customers(
+    database: DatabaseResource, conn: Connection, customers: pd.DataFrame
+) -> None:
+    """
+    UPSERTs customers in a single statement: the frame is coerced column-wise,
+    COPYed into a TEMP staging table and merged into `customers`. Existing rows
+    are only updated while they still hold the '[Unknown Customer]' /
+    '[Unknown Company]' placeholder names or no tenant yet.
+    """
+    staged = customers.assign(
+        is_active=customers["is_active"].astype("boolean").fillna(True).astype(bool),
+        is_supplier=customers["is_supplier"].astype("boolean").fillna(False).astype(bool),
+    )
+
+    database.stage_dataframe(
+        conn, staged, customers_staging_table_name, customer_staging_types
+    )
+
+    # DISTINCT ON keeps a repeated contact from hitting ON CONFLICT twice.
+    upsert_sql = text(f"""
+        INSERT INTO customers (
+            id, name, company_name, is_active, is_supplier, tenant,
+            created_at, updated_at
+        )
+        SELECT DISTINCT ON (id)
+            id, name, company_name, is_active, is_supplier, tenant, NOW(), NOW()
+        FROM {customers_staging_table_name}
+        ORDER BY id
+        ON CONFLICT (id) DO UPDATE
+        SET
+            name = EXCLUDED.name,
+            company_name = EXCLUDED.company_name,
+            is_active = EXCLUDED.is_active,
+            is_supplier = EXCLUDED.is_supplier,
+            tenant = EXCLUDED.tenant,
+            updated_at = NOW()
+        WHERE customers.name = '[Unknown Customer]'
+          OR customers.company_name = '[Unknown Company]'
+          OR customers.tenant = '';
+    """)
+
+    conn.execute(upsert_sql)
+
+
+def insert_placeholder_customers(conn: Connection, staging_table_name: str) -> None:
+    """
+    Inserts a '[Unknown Customer]' placeholder for every customer referenced by
+    the staged invoices that does not exist yet, as one set-based statement.
+    """
+    placeholder_sql = text(f"""
+        INSERT INTO customers (
+            id, name, company_name, is_active, is_supplier, tenant,
+            created_at, updated_at
+        )
+        SELECT DISTINCT
+            s.customer_id, '[Unknown Customer]', '[Unknown Company]',
+            TRUE, FALSE, s.tenant, NOW(), NOW()
+        FROM {staging_table_name} AS s
+        WHERE s.customer_id IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM customers AS c WHERE c.id = s.customer_id
+          )
+        ON CONFLICT (id) DO NOTHING;
+    """)
+
+    conn.execute(placeholder_sql)
+
+
+def refresh_invoice_balances(conn: Connection, invoice_ids_table_name: str) -> None:
+    """
+    Recomputes `balance_amount` as the total less every stored payment for the
+    invoices listed in the `invoice_id` column of `invoice_ids_table_name`,
+    rewriting only the balances that change.
+    """
+    balance_sql = text(f"""
+        UPDATE invoices AS i
+        SET balance_amount = i.total_amount - COALESCE(paid.total_paid, 0),
+            updated_at = NOW()
+        FROM (SELECT DISTINCT invoice_id FROM {invoice_ids_table_name}) AS c
+        LEFT JOIN (
+            SELECT p.invoice_id, SUM(p.total_amount) AS total_paid
+            FROM payments AS p
+            WHERE p.invoice_id IN (
+                SELECT invoice_id FROM {invoice_ids_table_name}
+            )
+            GROUP BY p.invoice_id
+        ) AS paid ON paid.invoice_id = c.invoice_id
+        WHERE i.invoice_id = c.invoice_id
+          AND i.balance_amount IS DISTINCT FROM
+              i.total_amount - COALESCE(paid.total_paid, 0);
+    """)
+
+    conn.execute(balance_sql)
+
+
+def upsert_invoices(
+    database: DatabaseResource,
+    conn: Connection,
+    chunks: Iterable[pd.DataFrame],
+    staging_table_name: str,
+) -> int:
+    """
+    COPYs the AR aging data into a TEMP staging table one chunk at a time, so
+    only a single chunk is held in memory, then creates placeholders for
+    unknown customers and UPSERTs the invoices by `invoice_id`. Amounts
+    arrive in cents and are converted back to currency units in the UPSERT.
+
+    The staged balances only net the payments extracted alongside the
+    invoices, so every UPSERTed invoice's balance is then recomputed from all
+    of its stored payments.
+
+    Returns the number of staged invoices.
+    """
+    database.create_staging_table(conn, staging_table_name, invoice_staging_types)
+
+    num_rows = 0
+    for chunk in chunks:
+        database.copy_dataframe(
+            conn, chunk[list(invoice_staging_types)], staging_table_name
+        )
+        num_rows += len(chunk)
+
+    if not num_rows:
+        return 0
+
+    insert_placeholder_customers(conn, staging_table_name)
+
+    set_clause = ", ".join(
+        [f"{col} = EXCLUDED.{col}" for col in invoice_update_columns]
+    )
+
+    # DISTINCT ON keeps an invoice listed twice, e.g. by offset pages shifting
+    # under a changing listing, from hitting ON CONFLICT twice.
+    upsert_sql = text(f"""
+        INSERT INTO {invoices_table_name} (
+            invoice_id, customer_id, invoice_number, currency,
+            total_amount, balance_amount, tax_amount,
+            invoice_at, due_at, days_overdue, aging_bucket,
+            status, type, notes, posted_at, paid_amount, tenant,
+            created_at, updated_at
+        )
+        SELECT DISTINCT ON (invoice_id)
+            invoice_id, customer_id, invoice_number, currency,
+            total_amount / 100.0, balance_amount / 100.0, tax_amount / 100.0,
+            invoice_at, due_at, days_overdue,
+            aging_bucket, status, type, notes, posted_at,
+            paid_amount / 100.0, tenant, NOW(), NOW()
+        FROM {staging_table_name}
+        ORDER BY invoice_id
+        ON CONFLICT (invoice_id) DO UPDATE SET
+            {set_clause},
+            updated_at = NOW();
+    """)
+
+    conn.execute(upsert_sql)
+    refresh_invoice_balances(conn, staging_table_name)
+    return num_rows
+
+
+def upsert_payments(
+    database: DatabaseResource,
+    conn: Connection,
+    payments: pd.DataFrame,
+    staging_table_name: str,
+) -> None:
+    """
+    COPYs the payments into a TEMP staging table and merges them into the
+    `payments` table by `payment_id`, only inserting new payments and
+    updating those that changed. The outstanding balance is then refreshed
+    for just the invoices those changed payments touch.
+    """
+    database.stage_dataframe(
+        conn, payments, staging_table_name, payment_staging_types
+    )
+
+    changed_invoices_table_name = f"{staging_table_name}_invoices"
+    database.create_staging_table(
+        conn, changed_invoices_table_name, {"invoice_id": "uuid"}
+    )
+
+    # A payment moved to another invoice also changes its previous invoice.
+    previous_invoices_sql = text(f"""
+        INSERT INTO {changed_invoices_table_name} (invoice_id)
+        SELECT p.invoice_id
+        FROM payments AS p
+        JOIN {staging_table_name} AS s ON s.payment_id = p.payment_id
+        WHERE p.invoice_id IS NOT NULL
+          AND p.invoice_id IS DISTINCT FROM s.invoice_id;
+    """)
+
+    conn.execute(previous_invoices_sql)
+
+    # Payments referencing customers/invoices we have not loaded keep a NULL
+    # foreign key, mirroring the model's SET_NULL behaviour. DISTINCT ON keeps
+    # a repeated payment from hitting ON CONFLICT twice.
+    upsert_sql = text(f"""
+        WITH upserted AS (
+            INSERT INTO payments (
+                id, payment_id, customer_id, invoice_id, account_id,
+                total_amount, currency, tenant, created_at, updated_at
+            )
+            SELECT DISTINCT ON (s.payment_id)
+                gen_random_uuid(), s.payment_id, c.id, i.invoice_id,
+                s.account_id, s.total_amount, s.currency, s.tenant,
+                s.created_at, s.updated_at
+            FROM {staging_table_name} AS s
+            LEFT JOIN customers AS c ON c.id = s.customer_id
+            LEFT JOIN invoices AS i ON i.invoice_id = s.invoice_id
+            ORDER BY s.payment_id, s.updated_at DESC NULLS LAST
+            ON CONFLICT (payment_id) DO UPDATE SET
+                customer_id = EXCLUDED.customer_id,
+                invoice_id = EXCLUDED.invoice_id,
+                account_id = EXCLUDED.account_id,
+                total_amount = EXCLUDED.total_amount,
+                currency = EXCLUDED.currency,
+                tenant = EXCLUDED.tenant,
+                updated_at = EXCLUDED.updated_at
+            WHERE (
+                payments.customer_id, payments.invoice_id, payments.account_id,
+                payments.total_amount, payments.currency, payments.tenant,
+                payments.updated_at
+            ) IS DISTINCT FROM (
+                EXCLUDED.customer_id, EXCLUDED.invoice_id, EXCLUDED.account_id,
+                EXCLUDED.total_amount, EXCLUDED.currency, EXCLUDED.tenant,
+                EXCLUDED.updated_at
+            )
+            RETURNING invoice_id
+        )
+        INSERT INTO {changed_invoices_table_name} (invoice_id)
+        SELECT invoice_id FROM upserted WHERE invoice_id IS NOT NULL;
+    """)
+
+    conn.execute(upsert_sql)
+
+    # Runs as its own statement so the SUM sees the payments merged above.
+    refresh_invoice_balances(conn, changed_invoices_table_name)
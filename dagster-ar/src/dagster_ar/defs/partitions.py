@@ -1,25 +1,36 @@
 import dagster as dg
 
+from dagster_ar.defs.aging import bucket_day_ranges, classify_day
+from dagster_ar.defs.daily_partitions import daily_partition
+
 
 # Define the aging bucket partition keys
-AGING_BUCKET_KEYS = ["0", "1", "2", "3", "4", "5"]
+AGING_BUCKET_KEYS = [str(bucket) for bucket in bucket_day_ranges()]
 
 # Create the static partition definition
 aging_bucket_partitions = dg.StaticPartitionsDefinition(AGING_BUCKET_KEYS)
 
+# One partition per Unified connection ID, added as each company is onboarded
+tenant_partitions = dg.DynamicPartitionsDefinition(name="tenants")
+
+# Tenant ingestion runs one connection's records updated on one day
+tenant_daily_partitions = dg.MultiPartitionsDefinition(
+    {"date": daily_partition, "tenant": tenant_partitions}
+)
+
+# Run tags of per-tenant ingestion, for capping how many tenants run at once
+TENANT_TAG_KEY = "dagster_ar/ingestion"
+TENANT_TAGS = {TENANT_TAG_KEY: "tenant"}
+
 
 def get_aging_bucket_info():
     """
     Get aging bucket information mapping partition keys to day ranges.
-    Returns a dictionary mapping partition key to (min_days, max_days).
+    Returns a dictionary mapping partition key to (min_days, max_days), where
+    a max_days of None means no upper limit.
     """
     return {
-        "0": (0, 0),      # Current
-        "1": (1, 30),     # 1-30 days
-        "2": (31, 60),    # 31-60 days
-        "3": (61, 90),    # 61-90 days
-        "4": (91, 120),   # 91-120 days
-        "5": (121, None), # 120+ days (None means no upper limit)
+        str(bucket): day_range for bucket, day_range in bucket_day_ranges().items()
     }
 
 
@@ -38,16 +49,4 @@ def get_partition_key_for_record(record) -> str:
     else:
         return "0"
 
-    # Use the same logic as the categorize function
-    if days_overdue is None or days_overdue <= 0:
-        return "0"
-    elif days_overdue <= 30:
-        return "1"
-    elif days_overdue <= 60:
-        return "2"
-    elif days_overdue <= 90:
-        return "3"
-    elif days_overdue <= 120:
-        return "4"
-    else:
-        return "5"
+    return str(classify_day(days_overdue))
@@ -1,11 +1,10 @@
-from dagster import ConfigurableResource
 from pydantic import Field
-import requests
+from dagster_ar.defs.resources.http import PooledHTTPResource
 from urllib.parse import urljoin, urlencode
 from typing import Any
 
 
-class APIClientResource(ConfigurableResource):
+class APIClientResource(PooledHTTPResource):
     """A configurable resource for connecting to an external API."""
 
     base_url: str = Field(
@@ -39,7 +38,11 @@ class APIClientResource(ConfigurableResource):
             query_string = urlencode(params)
             url = f"{url}?{query_string}"
 
-        response = requests.get(url, headers=self._get_headers())
+        session = self._get_session()
+        self._throttle()
+        response = session.get(
+            url, headers=self._get_headers(), timeout=self.request_timeout
+        )
 
         # Raise an exception for bad status codes (4xx or 5xx)
         response.raise_for_status()
@@ -1,19 +1,50 @@
+import io
 from typing import Generator
 from dagster import Any, ConfigurableResource, InitResourceContext
-from pydantic import PrivateAttr
-from sqlalchemy import create_engine, Engine
+import pandas as pd
+from pydantic import Field, PrivateAttr
+from sqlalchemy import create_engine, text, Engine
 from sqlalchemy.engine import Connection
 from contextlib import contextmanager
 
+# Marker written for missing values, so empty strings survive COPY as ''.
+COPY_NULL = "\\N"
+
+# Op tags of every asset that holds a Postgres connection, so executors and
+# the run queue can cap how many of them run at once.
+DATABASE_TAG_KEY = "dagster_ar/database"
+DATABASE_TAGS = {DATABASE_TAG_KEY: "postgres"}
+
 
 class DatabaseResource(ConfigurableResource):
-    """A configurable resource for connecting to PostgreSQL via SQLAlchemy."""
+    """
+    A configurable resource for connecting to PostgreSQL via SQLAlchemy.
+
+    Every process executing a step builds its own engine, so a run can hold
+    up to `pool_size + max_overflow` connections per concurrently running
+    database step.
+    """
 
     user: str
     password: str
     host: str
     port: int
     database: str
+    pool_size: int = Field(
+        default=2, description="Connections kept open in each process's pool."
+    )
+    max_overflow: int = Field(
+        default=0,
+        description="Connections opened beyond `pool_size` when the pool is exhausted.",
+    )
+    pool_pre_ping: bool = Field(
+        default=True,
+        description="Test pooled connections before use, replacing dropped ones.",
+    )
+    statement_timeout: int | None = Field(
+        default=None,
+        description="Abort statements running longer than this many milliseconds.",
+    )
 
     _engine: Engine | None = PrivateAttr(default=None)
 
@@ -21,7 +52,17 @@ class DatabaseResource(ConfigurableResource):
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
     def setup_for_execution(self, context: InitResourceContext) -> None:
-        self._engine = create_engine(self._get_uri())
+        connect_args = {}
+        if self.statement_timeout:
+            connect_args["options"] = f"-c statement_timeout={self.statement_timeout}"
+
+        self._engine = create_engine(
+            self._get_uri(),
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=self.pool_pre_ping,
+            connect_args=connect_args,
+        )
 
     def teardown_after_execution(self, context: InitResourceContext) -> None:
         if self._engine is not None:
@@ -54,3 +95,62 @@ class DatabaseResource(ConfigurableResource):
 
         with self._engine.begin() as conn:
             yield conn
+
+    def copy_dataframe(
+        self,
+        conn: Connection,
+        frame: pd.DataFrame,
+        table_name: str,
+        chunk_size: int = 100_000,
+    ) -> None:
+        """
+        Streams a DataFrame into an existing table with PostgreSQL
+        `COPY ... FROM STDIN`, serialising `chunk_size` rows at a time as CSV
+        so the buffer stays bounded for large frames.
+        """
+        columns = ", ".join(frame.columns)
+        copy_sql = (
+            f"COPY {table_name} ({columns}) FROM STDIN "
+            f"WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+
+        cursor = conn.connection.cursor()
+        try:
+            for start in range(0, len(frame), chunk_size):
+                buffer = io.StringIO()
+                frame.iloc[start : start + chunk_size].to_csv(
+                    buffer, header=False, index=False, na_rep=COPY_NULL
+                )
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+        finally:
+            cursor.close()
+
+    def create_staging_table(
+        self, conn: Connection, table_name: str, column_types: dict[str, str]
+    ) -> None:
+        """
+        Creates a session-local TEMP staging table that is dropped when the
+        surrounding transaction commits. `column_types` maps each staged
+        column to its PostgreSQL type.
+        """
+        columns_ddl = ", ".join(
+            f"{column} {column_type}" for column, column_type in column_types.items()
+        )
+        conn.execute(
+            text(f"CREATE TEMP TABLE {table_name} ({columns_ddl}) ON COMMIT DROP")
+        )
+
+    def stage_dataframe(
+        self,
+        conn: Connection,
+        frame: pd.DataFrame,
+        table_name: str,
+        column_types: dict[str, str],
+    ) -> None:
+        """
+        Creates a TEMP staging table (see `create_staging_table`) and bulk
+        loads `frame` into it.
+        """
+        self.create_staging_table(conn, table_name, column_types)
+        self.copy_dataframe(conn, frame[list(column_types)], table_name)
@@ -0,0 +1,117 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+import dagster as dg
+from pydantic import Field, PrivateAttr
+from upath import UPath
+
+LANDED_SUFFIX = ".ndjson.gz"
+
+
+class LandingZoneResource(dg.ConfigurableResource):
+    """
+    Raw landing zone for API responses: every extract streams its records to
+    gzip-compressed newline-delimited JSON at
+    `<base_dir>/<tenant>/<object_type>/<YYYY-MM-DD>/<HHMMSS>-<label>.ndjson.gz`,
+    so downstream assets can later be re-run from the landed files instead of
+    the API. Every Unified connection (tenant) lands under its own directory,
+    so a replay never reads another tenant's records.
+    """
+
+    base_dir: str | None = Field(
+        default=None,
+        description=(
+            "Directory or fsspec URL (e.g. s3://bucket/landing) to land API "
+            "responses under. Defaults to `landing/` in the instance storage."
+        ),
+    )
+    replay_page_size: int = Field(
+        default=1000, description="Records per page when replaying landed files."
+    )
+
+    _base_path: UPath | None = PrivateAttr(default=None)
+
+    def setup_for_execution(self, context: dg.InitResourceContext) -> None:
+        base_dir = self.base_dir or os.path.join(
+            context.instance.storage_directory(), "landing"
+        )
+        self._base_path = UPath(base_dir)
+
+    def _get_directory(self, tenant: str, object_type: str, run_date: str) -> UPath:
+        return self._base_path / tenant / object_type / run_date
+
+    def land_pages(
+        self,
+        tenant: str,
+        object_type: str,
+        label: str,
+        pages: Iterable[list[dict]],
+    ) -> Iterator[list[dict]]:
+        """
+        Passes `pages` through unchanged while appending their records to a new
+        landed file. The file only appears under its final name once every
+        page has been written, so replays never pick up a partial extract.
+        """
+        now = datetime.now(timezone.utc)
+        directory = self._get_directory(tenant, object_type, now.date().isoformat())
+        directory.mkdir(parents=True, exist_ok=True)
+
+        path = directory / f"{now:%H%M%S}-{label}{LANDED_SUFFIX}"
+        partial = path.with_name(f"{path.name}.partial")
+
+        with partial.open("wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as file:
+            for page in pages:
+                file.writelines(
+                    (json.dumps(record, default=str) + "\n").encode()
+                    for record in page
+                )
+                yield page
+
+        partial.rename(path)
+
+    def replay_pages(
+        self,
+        tenant: str,
+        object_type: str,
+        run_date: str,
+        label: str = "*",
+        newest_first: bool = False,
+    ) -> Iterator[list[dict]]:
+        """
+        Yields the records `tenant` landed for `object_type` on `run_date`
+        (optionally only those whose label matches `label`), oldest file first
+        unless `newest_first`.
+
+        Raises:
+            FileNotFoundError: If no file matching `label` was landed that day,
+                so a replay never silently comes back empty. Raised when called,
+                before the first page is read.
+        """
+        directory = self._get_directory(tenant, object_type, run_date)
+        paths = sorted(
+            directory.glob(f"*-{label}{LANDED_SUFFIX}"),
+            key=lambda path: path.name,
+            reverse=newest_first,
+        )
+        if not paths:
+            raise FileNotFoundError(
+                f"No {object_type} landed on {run_date} under {directory} "
+                f"with label {label!r}"
+            )
+
+        return self._read_pages(paths)
+
+    def _read_pages(self, paths: list[UPath]) -> Iterator[list[dict]]:
+        for path in paths:
+            with path.open("rb") as raw, gzip.GzipFile(fileobj=raw, mode="rb") as file:
+                page = []
+                for line in file:
+                    page.append(json.loads(line))
+                    if len(page) == self.replay_page_size:
+                        yield page
+                        page = []
+                if page:
+                    yield page
@@ -0,0 +1,288 @@
+import os
+from contextlib import ExitStack
+from typing import Iterable, Iterator
+
+import dagster as dg
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import Field
+from upath import UPath
+
+# Input metadata key listing the columns a downstream asset reads, e.g.
+# `dg.AssetIn("transform_payments", metadata={COLUMNS: ["invoice_id"]})`.
+COLUMNS = "columns"
+
+# Input metadata key asking for an iterable of DataFrames of at most this many
+# rows instead of one frame, e.g. `metadata={CHUNK_SIZE: 50_000}`.
+CHUNK_SIZE = "chunk_size"
+
+
+def _iter_batches(
+    parquet_file: pq.ParquetFile, columns: list[str] | None, chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+
+class ParquetChunks:
+    """
+    Iterable of a Parquet file's DataFrames of at most `chunk_size` rows,
+    read from the file as they are iterated.
+
+    Not a generator itself: UPathIOManager would mistake one for a coroutine
+    on Python < 3.12 and try to run it.
+    """
+
+    def __init__(
+        self,
+        path: UPath,
+        columns: list[str] | None,
+        chunk_size: int,
+        memory_map: bool,
+    ):
+        self.path = path
+        self.columns = columns
+        self.chunk_size = chunk_size
+        self.memory_map = memory_map
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        if self.memory_map:
+            with pq.ParquetFile(os.fspath(self.path), memory_map=True) as parquet_file:
+                yield from _iter_batches(parquet_file, self.columns, self.chunk_size)
+        else:
+            with self.path.open("rb") as file, pq.ParquetFile(file) as parquet_file:
+                yield from _iter_batches(parquet_file, self.columns, self.chunk_size)
+
+
+class PartitionedFrames:
+    """
+    Iterable of dicts holding a DataFrame per partition key, such as the pages
+    of one listing split into the partitions they span. As an output, every
+    partition's frames are written as row groups of its own file while the
+    stream is read, so no partition is held in memory as a whole.
+
+    Not a generator itself, for the same reason as `ParquetChunks`.
+    """
+
+    def __init__(self, parts: Iterable[dict[str, pd.DataFrame]]):
+        self.parts = parts
+
+    def __iter__(self) -> Iterator[dict[str, pd.DataFrame]]:
+        return iter(self.parts)
+
+
+class ParquetFilesystemIOManager(dg.UPathIOManager):
+    """
+    Stores DataFrame outputs as compressed Parquet files, one per asset (and
+    per partition for partitioned assets), and reads back only the columns an
+    input asks for.
+
+    An output may also be an iterable of DataFrames sharing one schema, which
+    is written a row group at a time; inputs with `CHUNK_SIZE` metadata read
+    the file back the same way, so neither side holds the whole dataset.
+
+    Outputs spanning several partitions (single-run backfills) are dicts of
+    either kind keyed by partition key, or a `PartitionedFrames` stream, and
+    are written one file per partition; inputs spanning several partitions
+    come back as dicts keyed by partition key.
+    """
+
+    extension: str = ".parquet"
+
+    def __init__(self, base_path: UPath, compression: str, memory_map: bool):
+        super().__init__(base_path=base_path)
+        self.compression = compression
+        self.memory_map = memory_map
+
+    def handle_output(self, context: dg.OutputContext, obj) -> None:
+        # A single-run backfill materializes several partitions in one step,
+        # so its output holds each partition's data by key.
+        if not (
+            context.has_asset_partitions
+            and isinstance(obj, (dict, PartitionedFrames))
+        ):
+            return super().handle_output(context, obj)
+
+        paths = self._get_paths_for_partitions(context)
+        if isinstance(obj, dict) and set(obj) != set(paths):
+            raise self._partitions_mismatch(context, obj, paths)
+
+        for path in paths.values():
+            self._handle_transition_to_partitioned_asset(context, path.parent)
+            self.make_directory(path.parent)
+
+        if isinstance(obj, PartitionedFrames):
+            num_rows = self._write_partitions(context, obj, paths)
+        else:
+            num_rows = sum(
+                self._write(obj[partition_key], path)[0]
+                for partition_key, path in paths.items()
+            )
+
+        # Metadata is shared by every partition the step materializes.
+        if len(paths) == 1:
+            context.add_output_metadata({"num_rows": dg.MetadataValue.int(num_rows)})
+        else:
+            context.add_output_metadata(
+                {
+                    "num_rows_in_run": dg.MetadataValue.int(num_rows),
+                    "num_partitions": dg.MetadataValue.int(len(paths)),
+                }
+            )
+
+    def dump_to_path(
+        self,
+        context: dg.OutputContext,
+        obj: pd.DataFrame | Iterable[pd.DataFrame],
+        path: UPath,
+    ) -> None:
+        num_rows, num_columns = self._write(obj, path)
+
+        # Chunked outputs can only be counted while being written.
+        if not isinstance(obj, pd.DataFrame):
+            context.add_output_metadata(
+                {
+                    "num_rows": dg.MetadataValue.int(num_rows),
+                    "num_columns": dg.MetadataValue.int(num_columns),
+                }
+            )
+
+    def _partitions_mismatch(
+        self, context: dg.OutputContext, partition_keys: Iterable[str], paths: dict
+    ) -> dg.DagsterInvariantViolationError:
+        return dg.DagsterInvariantViolationError(
+            f"Output of {context.asset_key.to_user_string()} holds partitions "
+            f"{sorted(partition_keys)}, but the step materializes {sorted(paths)}."
+        )
+
+    def _write(
+        self, obj: pd.DataFrame | Iterable[pd.DataFrame], path: UPath
+    ) -> tuple[int, int]:
+        """Writes a frame or an iterable of frames; returns rows and columns."""
+        if isinstance(obj, pd.DataFrame):
+            table = pa.Table.from_pandas(obj, preserve_index=False)
+            with path.open("wb") as file:
+                pq.write_table(table, file, compression=self.compression)
+            return table.num_rows, table.num_columns
+
+        num_rows = 0
+        with path.open("wb") as file:
+            writer = None
+            for chunk in obj:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        file, table.schema, compression=self.compression
+                    )
+                writer.write_table(table)
+                num_rows += table.num_rows
+
+            if writer is None:
+                pq.write_table(pa.table({}), file, compression=self.compression)
+                return 0, 0
+            writer.close()
+
+        return num_rows, len(writer.schema)
+
+    def _write_partitions(
+        self,
+        context: dg.OutputContext,
+        obj: PartitionedFrames,
+        paths: dict[str, UPath],
+    ) -> int:
+        """
+        Writes a stream of frames by partition key, keeping one writer open
+        per partition; returns the rows written across all of them.
+        """
+        num_rows = 0
+        with ExitStack() as stack:
+            writers: dict[str, pq.ParquetWriter] = {}
+            for parts in obj:
+                if not set(parts) <= set(paths):
+                    raise self._partitions_mismatch(context, parts, paths)
+
+                for partition_key, frame in parts.items():
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+                    if partition_key not in writers:
+                        file = stack.enter_context(paths[partition_key].open("wb"))
+                        writers[partition_key] = stack.enter_context(
+                            pq.ParquetWriter(
+                                file, table.schema, compression=self.compression
+                            )
+                        )
+                    writers[partition_key].write_table(table)
+                    num_rows += table.num_rows
+
+            # Like an empty chunked output, a partition the stream never
+            # reached still gets a file.
+            for partition_key, path in paths.items():
+                if partition_key not in writers:
+                    with path.open("wb") as file:
+                        pq.write_table(
+                            pa.table({}), file, compression=self.compression
+                        )
+
+        return num_rows
+
+    def load_from_path(
+        self, context: dg.InputContext, path: UPath
+    ) -> pd.DataFrame | ParquetChunks:
+        metadata = context.definition_metadata or {}
+        columns = metadata.get(COLUMNS)
+
+        if metadata.get(CHUNK_SIZE):
+            return ParquetChunks(
+                path, columns, metadata[CHUNK_SIZE], self._can_memory_map(path)
+            )
+
+        # Memory-mapping only applies to files on the local filesystem.
+        if self._can_memory_map(path):
+            table = pq.read_table(os.fspath(path), columns=columns, memory_map=True)
+        else:
+            with path.open("rb") as file:
+                table = pq.read_table(file, columns=columns)
+
+        return table.to_pandas()
+
+    def _can_memory_map(self, path: UPath) -> bool:
+        return self.memory_map and path.protocol in ("", "file")
+
+    def get_metadata(
+        self, context: dg.OutputContext, obj: pd.DataFrame | Iterable[pd.DataFrame]
+    ) -> dict[str, dg.MetadataValue]:
+        if not isinstance(obj, pd.DataFrame):
+            return {}
+
+        return {
+            "num_rows": dg.MetadataValue.int(len(obj)),
+            "num_columns": dg.MetadataValue.int(len(obj.columns)),
+        }
+
+
+class ParquetIOManager(dg.ConfigurableIOManagerFactory):
+    """
+    IO manager for DataFrame assets backed by Parquet files under `base_dir`,
+    which may be a local directory or any fsspec URL (e.g. `s3://bucket/ar`).
+    Defaults to the Dagster instance's storage directory.
+    """
+
+    base_dir: str | None = Field(
+        default=None, description="Directory or URL the Parquet files live under."
+    )
+    compression: str = Field(
+        default="zstd", description="Parquet compression codec."
+    )
+    memory_map: bool = Field(
+        default=True, description="Memory-map local files when reading them back."
+    )
+
+    def create_io_manager(
+        self, context: dg.InitResourceContext
+    ) -> ParquetFilesystemIOManager:
+        base_dir = self.base_dir or context.instance.storage_directory()
+        return ParquetFilesystemIOManager(
+            base_path=UPath(base_dir),
+            compression=self.compression,
+            memory_map=self.memory_map,
+        )
@@ -1,32 +1,96 @@
 from common.types.customers import AccountingContact
 from common.types.invoice import AccountingInvoice
 from common.types.payments import PaymentPayment
-import dagster as dg
-import requests
+from dagster_ar.defs.resources.http import PooledHTTPResource
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pydantic import Field, PrivateAttr
 from urllib.parse import urljoin, urlencode
-from typing import Any
+from typing import Any, Iterator
+
+import dagster as dg
+
+try:
+    import ijson
+except ImportError:  # Optional: installed with the `streaming` extra.
+    ijson = None
+
+# Run tag of the jobs whose runs read one connection from several extract
+# steps at once, holding how many; each step gets that share of the rate.
+CONCURRENT_EXTRACTS_TAG_KEY = "dagster_ar/concurrent_extracts"
+
 
+def concurrent_extracts_tags(num_extracts: int) -> dict[str, str]:
+    """Run tags of a job running `num_extracts` extract steps at once."""
+    return {CONCURRENT_EXTRACTS_TAG_KEY: str(num_extracts)}
 
-class UnifiedAccountingResource(dg.ConfigurableResource):
+
+class UnifiedAccountingResource(PooledHTTPResource):
     """
     A resource for connecting to the Unified Accounting API endpoint, managing
     the base URL, connection ID, and authentication key.
+
+    `conn_id` is the default connection; every list method also takes a
+    `conn_id` to read another company's ledger with the same resource. With
+    `requests_per_second` set, each connection is throttled separately. Runs
+    tagged with `concurrent_extracts_tags` split that rate between the extract
+    steps reading the connection at once.
     """
 
     base_url: str
     conn_id: str
     api_key: str
+    page_size: int = 100
+    max_in_flight: int = Field(
+        default=4,
+        description="Maximum number of page requests in flight at once; 1 fetches serially.",
+    )
+    stream_decode: bool = Field(
+        default=False,
+        description=(
+            "Decode each page incrementally while it downloads instead of "
+            "buffering the whole body; needs the `streaming` extra (ijson)."
+        ),
+    )
+    stream_chunk_size: int = Field(
+        default=1000,
+        description="Records per chunk yielded while stream-decoding a page.",
+    )
+    connection_requests_per_second: dict[str, float] = Field(
+        default={},
+        description=(
+            "Per connection ID overrides of requests_per_second, for "
+            "connections whose upstream ledger has a tighter quota."
+        ),
+    )
 
-    def _request(
+    # Extract steps of the run reading one connection at once, from its tags
+    _concurrent_extracts: int = PrivateAttr(default=1)
+
+    def setup_for_execution(self, context: dg.InitResourceContext) -> None:
+        if self.stream_decode and ijson is None:
+            raise ImportError(
+                "stream_decode requires ijson; install dagster_ar[streaming]"
+            )
+        tags = context.dagster_run.tags if context.dagster_run else {}
+        self._concurrent_extracts = max(int(tags.get(CONCURRENT_EXTRACTS_TAG_KEY, 1)), 1)
+        super().setup_for_execution(context)
+
+    def _get_rate_limit(self, key: str) -> float | None:
+        rate = self.connection_requests_per_second.get(key, self.requests_per_second)
+        # Steps run in separate processes, so each throttles its own share.
+        return rate and rate / self._concurrent_extracts
+
+    def _build_url(
         self,
         resource_url: str,
         endpoint_path: str,
         params: dict[str, Any] | None = None,
-    ) -> Any:
-        """
-        Internal method to build the full URL, execute the GET request, and handle errors.
-        """
-        accounting_base = urljoin(self.base_url, f"{resource_url}/{self.conn_id}/")
+        conn_id: str | None = None,
+    ) -> str:
+        accounting_base = urljoin(
+            self.base_url, f"{resource_url}/{conn_id or self.conn_id}/"
+        )
 
         url = urljoin(accounting_base, endpoint_path)
 
@@ -34,18 +98,215 @@ class UnifiedAccountingResource(dg.ConfigurableResource):
             query_string = urlencode(params)
             url = f"{url}?{query_string}"
 
+        return url
+
+    def _request(
+        self,
+        resource_url: str,
+        endpoint_path: str,
+        params: dict[str, Any] | None = None,
+        conn_id: str | None = None,
+    ) -> Any:
+        """
+        Internal method to build the full URL, execute the GET request, and handle errors.
+        Requests go through the pooled session, which retries throttled (429) and
+        5xx responses with backoff before giving up.
+        """
+        conn_id = conn_id or self.conn_id
+        url = self._build_url(resource_url, endpoint_path, params, conn_id)
         headers = {"Authorization": f"Bearer {self.api_key}"}
 
-        resp = requests.get(url, headers=headers)
+        session = self._get_session()
+        self._throttle(conn_id)
+        resp = session.get(url, headers=headers, timeout=self.request_timeout)
         resp.raise_for_status()
 
         return resp.json()
 
+    def _stream_request(
+        self,
+        resource_url: str,
+        endpoint_path: str,
+        params: dict[str, Any] | None = None,
+        conn_id: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Like `_request` for list endpoints, but parses the JSON array with
+        ijson as the body arrives and yields its records one at a time, so
+        neither the raw body nor the whole page is ever held in memory.
+        """
+        conn_id = conn_id or self.conn_id
+        url = self._build_url(resource_url, endpoint_path, params, conn_id)
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        session = self._get_session()
+        self._throttle(conn_id)
+        with session.get(
+            url, headers=headers, timeout=self.request_timeout, stream=True
+        ) as resp:
+            resp.raise_for_status()
+            # Let urllib3 undo gzip/deflate transfer encoding while streaming.
+            resp.raw.decode_content = True
+            yield from ijson.items(resp.raw, "item", use_float=True)
+
+    def _iter_streamed_pages(
+        self,
+        resource_url: str,
+        endpoint_path: str,
+        params: dict[str, Any],
+        limit: int,
+        offset: int,
+        conn_id: str | None = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Walks the list endpoint one page at a time, stream-decoding each
+        response and yielding its records in chunks of `stream_chunk_size`.
+        """
+        while True:
+            received = 0
+            chunk: list[dict[str, Any]] = []
+
+            records = self._stream_request(
+                resource_url,
+                endpoint_path,
+                {**params, "limit": limit, "offset": offset},
+                conn_id,
+            )
+            for record in records:
+                received += 1
+                chunk.append(record)
+                if len(chunk) == self.stream_chunk_size:
+                    yield chunk
+                    chunk = []
+
+            if chunk:
+                yield chunk
+            if received < limit:
+                return
+            offset += limit
+
+    def _iter_pages(
+        self,
+        resource_url: str,
+        endpoint_path: str,
+        params: dict[str, Any] | None = None,
+        conn_id: str | None = None,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Walks an offset-paginated list endpoint and yields each page, in order,
+        as soon as it arrives. Stops at the first page shorter than the
+        requested limit.
+
+        Pages are requested ahead of the consumer, one more for every full
+        page received, up to `max_in_flight`. Long walks are then bound by
+        throughput rather than by one round trip per page, while short ones
+        request few or no pages past their end.
+        With `stream_decode`, pages are instead decoded incrementally and
+        yielded in chunks of at most `stream_chunk_size` records.
+        """
+        params = dict(params or {})
+        limit = int(params.pop("limit", self.page_size))
+        offset = int(params.pop("offset", 0))
+
+        if self.stream_decode:
+            # Streamed responses are consumed as they arrive, so pages are
+            # walked serially rather than requested ahead.
+            yield from self._iter_streamed_pages(
+                resource_url, endpoint_path, params, limit, offset, conn_id
+            )
+            return
+
+        def fetch(page_offset: int) -> list[dict[str, Any]]:
+            return self._request(
+                resource_url,
+                endpoint_path,
+                {**params, "limit": limit, "offset": page_offset},
+                conn_id,
+            )
+
+        # Create the shared session before worker threads race to do so.
+        self._get_session()
+
+        with ThreadPoolExecutor(max_workers=max(self.max_in_flight, 1)) as executor:
+            in_flight: deque[Future] = deque()
+            next_offset = offset
+            full_pages = 0
+
+            try:
+                while True:
+                    # Read ahead by one more page for every full page received
+                    # past the first, so a listing of one or two pages never
+                    # requests past its end and only long ones reach
+                    # `max_in_flight`.
+                    ahead = max(1, min(self.max_in_flight, full_pages))
+                    while len(in_flight) < ahead:
+                        in_flight.append(executor.submit(fetch, next_offset))
+                        next_offset += limit
+
+                    page = in_flight.popleft().result()
+                    if page:
+                        yield page
+                    if len(page) < limit:
+                        return
+                    full_pages += 1
+            finally:
+                # Requests issued past the end of the dataset are discarded.
+                for future in in_flight:
+                    future.cancel()
+
+    def iter_invoice_pages(
+        self, params: dict[str, Any] | None = None, conn_id: str | None = None
+    ) -> Iterator[list[AccountingInvoice]]:
+        """
+        Iterates over every page of invoices from the Unified Accounting API.
+
+        Args:
+            params: A dictionary of query parameters
+                (e.g env=Sandbox). `limit` overrides the page size.
+            conn_id: The connection to read; defaults to the resource's.
+
+        Returns:
+            An iterator of invoice pages.
+        """
+        return self._iter_pages("accounting", "invoice", params, conn_id)
+
+    def iter_customer_pages(
+        self, params: dict[str, Any] | None = None, conn_id: str | None = None
+    ) -> Iterator[list[AccountingContact]]:
+        """
+        Iterates over every page of customers from the Unified Accounting API.
+
+        Args:
+            params: A dictionary of query parameters
+                (e.g env=Sandbox). `limit` overrides the page size.
+            conn_id: The connection to read; defaults to the resource's.
+
+        Returns:
+            An iterator of customer pages.
+        """
+        return self._iter_pages("accounting", "contact", params, conn_id)
+
+    def iter_payment_pages(
+        self, params: dict[str, Any] | None = None, conn_id: str | None = None
+    ) -> Iterator[list[PaymentPayment]]:
+        """
+        Iterates over every page of payments from the Unified Accounting API.
+
+        Args:
+            params: A dictionary of query parameters
+                (e.g env=Sandbox). `limit` overrides the page size.
+            conn_id: The connection to read; defaults to the resource's.
+
+        Returns:
+            An iterator of payment pages.
+        """
+        return self._iter_pages("payment", "payment", params, conn_id)
+
     def get_invoices(
         self, params: dict[str, Any] | None = None
     ) -> list[AccountingInvoice]:
         """
-        Fetches invoice data from the Unified Accounting API.
+        Fetches all invoice data from the Unified Accounting API.
 
         Args:
             params: A dictionary of query parameters
@@ -54,13 +315,13 @@ class UnifiedAccountingResource(dg.ConfigurableResource):
         Returns:
             A list of invoice dictionaries.
         """
-        return self._request("accounting", "invoice", params)
+        return [invoice for page in self.iter_invoice_pages(params) for invoice in page]
 
     def get_customers(
         self, params: dict[str, Any] | None = None
     ) -> list[AccountingContact]:
         """
-        Fetches customer data from the Unified Accounting API.
+        Fetches all customer data from the Unified Accounting API.
 
         Args:
             params: A dictionary of query parameters
@@ -69,13 +330,15 @@ class UnifiedAccountingResource(dg.ConfigurableResource):
         Returns:
             A list of customer dictionaries.
         """
-        return self._request("accounting", "contact", params)
+        return [
+            customer for page in self.iter_customer_pages(params) for customer in page
+        ]
 
     def get_payments(
         self, params: dict[str, Any] | None = None
     ) -> list[PaymentPayment]:
         """
-        Fetches payment data from the Unified Accounting API.
+        Fetches all payment data from the Unified Accounting API.
 
         Args:
             params: A dictionary of query parameters
@@ -84,4 +347,4 @@ class UnifiedAccountingResource(dg.ConfigurableResource):
         Returns:
             A list of payment dictionaries.
         """
-        return self._request("payment", "payment", params)
+        return [payment for page in self.iter_payment_pages(params) for payment in page]
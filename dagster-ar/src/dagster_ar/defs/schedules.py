@@ -1,10 +1,96 @@
 import dagster as dg
-from dagster_ar.defs.jobs import daily_update_job
+from dagster_ar.defs.daily_partitions import daily_partition
+from dagster_ar.defs.jobs import daily_update_job, nightly_aging_job, tenant_ingestion_job
+from dagster_ar.defs.partitions import tenant_partitions
 
-# Schedule to run daily update job every midnight UTC
-daily_update_schedule = dg.ScheduleDefinition(
+# Days back the daily update schedule looks for partitions whose load never
+# committed, e.g. because a transform or load step failed
+DAILY_CATCH_UP_DAYS = 7
+
+# Run tag holding the partition key a run materializes
+PARTITION_TAG_KEY = "dagster/partition"
+
+UNFINISHED_RUN_STATUSES = [
+    dg.DagsterRunStatus.NOT_STARTED,
+    dg.DagsterRunStatus.QUEUED,
+    dg.DagsterRunStatus.STARTING,
+    dg.DagsterRunStatus.STARTED,
+]
+
+
+def partitions_in_progress(instance: dg.DagsterInstance, job_name: str) -> set[str]:
+    """
+    Partition keys of the `job_name` runs that are queued or in progress, so
+    a catch-up does not request them again while they are still loading.
+    """
+    runs = instance.get_runs(
+        filters=dg.RunsFilter(job_name=job_name, statuses=UNFINISHED_RUN_STATUSES)
+    )
+    return {run.tags[PARTITION_TAG_KEY] for run in runs if PARTITION_TAG_KEY in run.tags}
+
+
+# Schedule to run the daily update job every midnight UTC for the day that just
+# ended, so each run only fetches and loads that day's partition. Recent days
+# whose last step (load_payments) never materialized are requested again, so
+# a failed run's records are retried instead of skipped for good. Days with a
+# run still queued or in progress are left to that run.
+@dg.schedule(
     job=daily_update_job,
     cron_schedule="0 0 * * *",  # Every day at midnight UTC
     name="daily_update_schedule",
-    description="Runs daily update job every midnight to fetch new data from the last 24 hours"
+    description="Runs daily update job every midnight to fetch and load the records updated during the previous day, retrying recent days that never finished loading"
 )
+def daily_update_schedule(context: dg.ScheduleEvaluationContext):
+    partition_keys = daily_partition.get_partition_keys(
+        current_time=context.scheduled_execution_time
+    )[-DAILY_CATCH_UP_DAYS:]
+    loaded = context.instance.get_materialized_partitions(
+        dg.AssetKey("load_payments")
+    )
+    in_progress = partitions_in_progress(context.instance, daily_update_job.name)
+
+    for partition_key in partition_keys:
+        if partition_key in in_progress:
+            continue
+        if partition_key == partition_keys[-1] or partition_key not in loaded:
+            yield dg.RunRequest(partition_key=partition_key)
+
+
+# Schedule to re-age invoices shortly after the date rolls over, once the
+# daily update has had time to load the day's changes
+nightly_aging_schedule = dg.ScheduleDefinition(
+    job=nightly_aging_job,
+    cron_schedule="30 0 * * *",  # Every day at 00:30 UTC
+    name="nightly_aging_schedule",
+    description="Recomputes aging buckets in the database every night and refreshes the aging summary"
+)
+
+
+# Schedule to ingest every tenant's previous day each midnight, one run per
+# connection, so the run queue can start as many in parallel as its tag limits
+# allow. Like the daily update, recent days whose load never committed are
+# requested again, unless a run of theirs is still queued or in progress.
+@dg.schedule(
+    job=tenant_ingestion_job,
+    cron_schedule="0 0 * * *",  # Every day at midnight UTC
+    name="tenant_ingestion_schedule",
+    description="Requests a tenant ingestion run for the previous day of every connection in the tenants partitions, retrying recent days that never finished loading"
+)
+def tenant_ingestion_schedule(context: dg.ScheduleEvaluationContext):
+    days = daily_partition.get_partition_keys(
+        current_time=context.scheduled_execution_time
+    )[-DAILY_CATCH_UP_DAYS:]
+    loaded = context.instance.get_materialized_partitions(
+        dg.AssetKey("load_payments_by_tenant")
+    )
+    in_progress = partitions_in_progress(context.instance, tenant_ingestion_job.name)
+
+    for conn_id in tenant_partitions.get_partition_keys(
+        dynamic_partitions_store=context.instance
+    ):
+        for day in days:
+            partition_key = dg.MultiPartitionKey({"date": day, "tenant": conn_id})
+            if partition_key in in_progress:
+                continue
+            if day == days[-1] or partition_key not in loaded:
+                yield dg.RunRequest(partition_key=partition_key)
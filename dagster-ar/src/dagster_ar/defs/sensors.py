@@ -0,0 +1,64 @@
+import dagster as dg
+from dagster_ar.defs.jobs import (
+    aging_bucket_backfill_job,
+    aging_bucket_payments_job,
+    aging_bucket_shared_job,
+    aging_summary_job,
+    daily_update_job,
+    tenant_ingestion_job,
+)
+from dagster_ar.defs.schedules import UNFINISHED_RUN_STATUSES
+
+# Jobs whose loads change what the aging summary shows
+INGESTION_JOBS = [
+    daily_update_job,
+    aging_bucket_shared_job,
+    aging_bucket_backfill_job,
+    aging_bucket_payments_job,
+    tenant_ingestion_job,
+]
+
+# A failed or canceled run may still have committed some of its loads
+FINISHED_STATUSES = [
+    dg.DagsterRunStatus.SUCCESS,
+    dg.DagsterRunStatus.FAILURE,
+    dg.DagsterRunStatus.CANCELED,
+]
+
+
+# Sensor to refresh the aging summary once per batch of ingestion runs, e.g. a
+# schedule tick's tenant runs or a backfill's daily partitions, rather than
+# once per run: every refresh rescans all invoices and takes the view's lock.
+# The refresh waits until no ingestion run is queued or in progress, and is
+# keyed on the last run to finish so each batch is only refreshed once.
+@dg.sensor(
+    job=aging_summary_job,
+    minimum_interval_seconds=300,
+    name="aging_summary_sensor",
+    description="Refreshes the aging summary once every queued and in-progress ingestion run has finished"
+)
+def aging_summary_sensor(context: dg.SensorEvaluationContext):
+    instance = context.instance
+
+    for job in INGESTION_JOBS:
+        if instance.get_run_records(
+            dg.RunsFilter(job_name=job.name, statuses=UNFINISHED_RUN_STATUSES), limit=1
+        ):
+            return dg.SkipReason(f"Waiting for {job.name} runs to finish")
+
+    finished = [
+        record
+        for job in INGESTION_JOBS
+        for record in instance.get_run_records(
+            dg.RunsFilter(job_name=job.name, statuses=FINISHED_STATUSES),
+            limit=1,
+            order_by="update_timestamp",
+        )
+    ]
+    if not finished:
+        return dg.SkipReason("No ingestion run has finished yet")
+
+    last_finished = max(
+        finished, key=lambda record: (record.update_timestamp, record.storage_id)
+    )
+    return dg.RunRequest(run_key=last_finished.dagster_run.run_id)
@@ -0,0 +1,75 @@
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+from common.db.invoices import invoice_dtypes, invoice_source_columns
+from dagster_ar.defs.aging import classify_days_overdue, days_overdue_since
+
+# Invoices aged per chunk by the transform assets; peak memory follows this
+# rather than the size of the ledger.
+INVOICE_CHUNK_SIZE = 50_000
+
+
+def to_cents(amounts: pd.Series) -> pd.Series:
+    """Converts decimal currency amounts to nullable integer cents."""
+    return (pd.to_numeric(amounts, errors="coerce") * 100).round().astype("Int64")
+
+
+def total_paid_by_invoice(payments: pd.DataFrame) -> pd.Series:
+    """Pre-aggregates payments into the total paid per `invoice_id`, in cents."""
+    return to_cents(payments["total_amount"]).groupby(payments["invoice_id"]).sum()
+
+
+def age_invoices(
+    invoices: pd.DataFrame, total_paid: pd.Series, today: pd.Timestamp
+) -> pd.DataFrame:
+    """
+    Computes the balance, days overdue and aging bucket of a chunk of
+    extracted invoices, looking up what was paid on each in `total_paid`.
+
+    The chunk is modified in place rather than copied: its columns are
+    renamed to invoice_columns, amounts converted to cents and every column
+    cast to `invoice_dtypes`.
+    """
+    invoices.rename(columns=invoice_source_columns, inplace=True)
+
+    for column in ("total_amount", "paid_amount", "tax_amount"):
+        invoices[column] = to_cents(invoices[column])
+    invoices["total_paid"] = invoices["invoice_id"].map(total_paid).fillna(0)
+    invoices["balance_amount"] = invoices["total_amount"] - invoices["total_paid"]
+
+    invoices["invoice_at"] = pd.to_datetime(
+        invoices["invoice_at"], errors="coerce", utc=True
+    )
+    invoices["due_at"] = pd.to_datetime(invoices["due_at"], errors="coerce", utc=True)
+    invoices["days_overdue"] = days_overdue_since(invoices["due_at"], today)
+    invoices["aging_bucket"] = classify_days_overdue(invoices["days_overdue"])
+
+    # Categories inferred from an all-missing object column have no type, so
+    # go through strings to give every chunk the same dictionary schema.
+    for column in ("currency", "tenant"):
+        invoices[column] = invoices[column].astype("string[pyarrow]")
+    for column, dtype in invoice_dtypes.items():
+        invoices[column] = invoices[column].astype(dtype)
+
+    return invoices
+
+
+def age_invoice_chunks(
+    invoice_chunks: Iterable[pd.DataFrame],
+    total_paid: pd.Series,
+    aging_bucket: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily ages `invoice_chunks` against `total_paid` (see
+    `total_paid_by_invoice`), keeping only invoices in `aging_bucket` if one
+    is given. Chunks left empty are skipped.
+    """
+    today = pd.Timestamp.now(tz="UTC")
+
+    for chunk in invoice_chunks:
+        aged = age_invoices(chunk, total_paid, today)
+        if aging_bucket is not None:
+            aged = aged[aged["aging_bucket"] == aging_bucket]
+        if not aged.empty:
+            yield aged
@@ -0,0 +1,71 @@
+from typing import Callable, Sequence
+
+import pandas as pd
+import pytest
+
+from dagster_ar.defs.resources.database import DatabaseResource
+
+
+class RecordingConnection:
+    """
+    Stands in for a SQLAlchemy connection, recording every statement run with
+    its whitespace collapsed, so tests can match statements on one line.
+    """
+
+    def __init__(self):
+        self.statements: list[str] = []
+        self.copied: dict[str, list[pd.DataFrame]] = {}
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(" ".join(str(statement).split()))
+
+
+class RecordingDatabase(DatabaseResource):
+    """Keeps the frames COPYed into each staging table instead of sending them."""
+
+    def copy_dataframe(self, conn, frame, table_name, chunk_size=100_000):
+        conn.copied.setdefault(table_name, []).append(frame)
+
+
+@pytest.fixture
+def database() -> RecordingDatabase:
+    return RecordingDatabase(
+        user="ar", password="ar", host="localhost", port=5432, database="ar"
+    )
+
+
+@pytest.fixture
+def conn() -> RecordingConnection:
+    return RecordingConnection()
+
+
+@pytest.fixture
+def extracted_invoices() -> Callable[..., pd.DataFrame]:
+    """
+    Builds invoices as the extract assets write them, one per ID in `ids`.
+    Keyword arguments override a column for every invoice.
+    """
+
+    def build(
+        ids: Sequence[str] = ("11111111-1111-1111-1111-111111111111",), **columns
+    ) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "id": list(ids),
+                "contact_id": "22222222-2222-2222-2222-222222222222",
+                "invoice_number": [f"INV-{id_}" for id_ in ids],
+                "currency": "USD",
+                "total_amount": 100.0,
+                "paid_amount": None,
+                "tax_amount": None,
+                "invoice_at": None,
+                "due_at": "2025-01-01T00:00:00Z",
+                "posted_at": None,
+                "status": "AUTHORIZED",
+                "type": "BILL",
+                "notes": None,
+                "tenant": "conn_a",
+            }
+        ).assign(**columns)
+
+    return build
@@ -0,0 +1,62 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from dagster_ar.defs.aging import (
+    AGING_BUCKET_EDGES,
+    aging_bucket_sql,
+    bucket_day_ranges,
+    classify_days_overdue,
+)
+
+# Every bucket edge and the days either side of it.
+BOUNDARY_DAYS = sorted(
+    {day for edge in AGING_BUCKET_EDGES for day in (edge - 1, edge, edge + 1)}
+)
+
+
+def sql_buckets(days: list[int]) -> list[int]:
+    """Buckets `days` with the `aging_bucket_sql` CASE expression."""
+    with sqlite3.connect(":memory:") as db:
+        db.execute("CREATE TABLE aged (days_overdue integer)")
+        db.executemany("INSERT INTO aged VALUES (?)", [(day,) for day in days])
+        rows = db.execute(
+            f"SELECT {aging_bucket_sql('days_overdue')} FROM aged ORDER BY rowid"
+        )
+        return [bucket for (bucket,) in rows]
+
+
+@pytest.mark.parametrize(
+    "days, bucket",
+    [
+        (-1, 0),
+        (0, 0),
+        (1, 1),
+        (30, 1),
+        (31, 2),
+        (60, 2),
+        (61, 3),
+        (90, 3),
+        (91, 4),
+        (120, 4),
+        (121, 5),
+    ],
+)
+def test_edges_are_inclusive_upper_bounds(days, bucket):
+    assert classify_days_overdue([days]).tolist() == [bucket]
+
+
+def test_missing_days_are_current():
+    assert classify_days_overdue([None, np.nan]).tolist() == [0, 0]
+
+
+def test_sql_buckets_match_classify_days_overdue():
+    assert sql_buckets(BOUNDARY_DAYS) == classify_days_overdue(BOUNDARY_DAYS).tolist()
+
+
+def test_bucket_day_ranges_match_classify_days_overdue():
+    for bucket, (min_days, max_days) in bucket_day_ranges().items():
+        assert classify_days_overdue([min_days]).tolist() == [bucket]
+        if max_days is not None:
+            assert classify_days_overdue([max_days]).tolist() == [bucket]
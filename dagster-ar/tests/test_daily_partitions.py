@@ -0,0 +1,97 @@
+import pandas as pd
+
+from dagster_ar.defs.daily_partitions import (
+    daily_partition,
+    until_window_end,
+    updated_window_params,
+    within_window,
+)
+
+first_day = daily_partition.time_window_for_partition_key("2025-01-01")
+later_day = daily_partition.time_window_for_partition_key("2025-03-02")
+
+
+def records(*changes: tuple[str | None, str | None]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [str(index) for index in range(len(changes))],
+            "updated_at": [updated_at for updated_at, _ in changes],
+            "created_at": [created_at for _, created_at in changes],
+        }
+    )
+
+
+def page(*updated_at: str | None) -> list[dict]:
+    return [{"updated_at": value} for value in updated_at]
+
+
+def test_later_days_are_bounded_on_both_sides():
+    params = updated_window_params(later_day)
+
+    assert params["updated_gte"] == "2025-03-02T00:00:00+00:00"
+    assert params["updated_lt"] == "2025-03-03T00:00:00+00:00"
+
+
+def test_first_day_has_no_lower_bound():
+    params = updated_window_params(first_day)
+
+    assert "updated_gte" not in params
+    assert params["updated_lt"] == "2025-01-02T00:00:00+00:00"
+
+
+def test_within_window_keeps_only_the_day():
+    kept = within_window(
+        records(
+            ("2025-03-01T23:59:59Z", None),
+            ("2025-03-02T00:00:00Z", None),
+            ("2025-03-02T23:59:59Z", None),
+            ("2025-03-03T00:00:00Z", None),
+        ),
+        later_day,
+    )
+
+    assert kept["id"].tolist() == ["1", "2"]
+
+
+def test_first_day_keeps_everything_older():
+    kept = within_window(
+        records(("2019-06-01T00:00:00Z", None), ("2025-01-02T00:00:00Z", None)),
+        first_day,
+    )
+
+    assert kept["id"].tolist() == ["0"]
+
+
+def test_within_window_falls_back_to_created_at():
+    kept = within_window(
+        records(
+            (None, "2025-03-02T08:00:00Z"),
+            ("not a date", "2025-03-02T09:00:00Z"),
+            (None, "2025-03-01T08:00:00Z"),
+            ("2025-03-02T10:00:00Z", "2025-02-01T00:00:00Z"),
+            (None, None),
+        ),
+        later_day,
+    )
+
+    assert kept["id"].tolist() == ["0", "1", "3"]
+
+
+def test_listing_stops_after_the_window_end():
+    pages = [
+        page("2025-03-02T01:00:00Z", "2025-03-02T05:00:00Z"),
+        page("2025-03-02T09:00:00Z", "2025-03-03T01:00:00Z"),
+        page("2025-03-04T01:00:00Z"),
+    ]
+
+    assert list(until_window_end(iter(pages), later_day)) == pages[:2]
+
+
+def test_unordered_listing_is_read_to_the_end():
+    pages = [
+        page("2025-03-02T05:00:00Z", "2025-03-02T01:00:00Z"),
+        page("2025-03-03T01:00:00Z"),
+        page("2025-03-02T09:00:00Z"),
+    ]
+
+    assert list(until_window_end(iter(pages), later_day)) == pages
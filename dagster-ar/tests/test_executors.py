@@ -0,0 +1,25 @@
+from dagster_ar.defs.executors import DATABASE_CONCURRENCY_LIMIT, parallel_executor
+from dagster_ar.defs.resources.database import DATABASE_TAG_KEY, DATABASE_TAGS
+
+
+def executor_config(**config) -> dict:
+    """The multiprocess executor config `parallel_executor` maps `config` to."""
+    result = parallel_executor.config_schema.resolve_config({"config": config})
+    assert result.success
+    return result.value["config"]
+
+
+def test_database_steps_are_capped_by_their_tag():
+    config = executor_config(max_concurrent=8, database_concurrency=2)
+
+    assert config["max_concurrent"] == 8
+    assert config["tag_concurrency_limits"] == [
+        {"key": DATABASE_TAG_KEY, "value": DATABASE_TAGS[DATABASE_TAG_KEY], "limit": 2}
+    ]
+
+
+def test_database_concurrency_defaults_to_the_limit():
+    fields = parallel_executor.config_schema.config_type.fields
+
+    assert fields["database_concurrency"].default_value == DATABASE_CONCURRENCY_LIMIT
+    assert fields["max_concurrent"].default_value == 0
@@ -0,0 +1,89 @@
+import pytest
+
+from dagster_ar.defs.resources import http
+from dagster_ar.defs.resources.http import PooledHTTPResource, RateLimiter, build_session
+
+
+def test_session_retries_throttling_and_server_errors():
+    session = build_session(
+        pool_size=4,
+        max_retries=3,
+        backoff_factor=0.5,
+        backoff_jitter=0.25,
+        backoff_max=10.0,
+    )
+
+    for prefix in ("https://", "http://"):
+        adapter = session.get_adapter(f"{prefix}api.example.com")
+        retry = adapter.max_retries
+
+        assert set(retry.status_forcelist) == {429, 500, 502, 503, 504}
+        assert retry.total == 3
+        assert retry.backoff_factor == 0.5
+        assert retry.respect_retry_after_header
+        assert "GET" in retry.allowed_methods
+        assert "POST" not in retry.allowed_methods
+        assert adapter._pool_maxsize == 4
+
+
+def test_session_keeps_connections_alive():
+    session = build_session(
+        pool_size=1, max_retries=0, backoff_factor=0, backoff_jitter=0, backoff_max=0
+    )
+
+    assert session.headers["Connection"] == "keep-alive"
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+
+class FakeClock:
+    """Stands in for the `time` module, advancing only when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(http, "time", clock)
+    return clock
+
+
+def test_requests_are_spaced_evenly(clock):
+    limiter = RateLimiter(4)
+
+    starts = []
+    for _ in range(4):
+        limiter.acquire()
+        starts.append(clock.now)
+
+    assert starts == [0.0, 0.25, 0.5, 0.75]
+
+
+def test_idle_time_does_not_allow_a_burst(clock):
+    limiter = RateLimiter(2)
+    limiter.acquire()
+    clock.sleep(10)
+
+    starts = []
+    for _ in range(3):
+        limiter.acquire()
+        starts.append(clock.now)
+
+    assert starts == [10.0, 10.5, 11.0]
+
+
+def test_each_key_is_throttled_on_its_own(clock):
+    resource = PooledHTTPResource(requests_per_second=2)
+
+    for key in ["conn_a", "conn_b", "conn_a"]:
+        resource._throttle(key)
+
+    # conn_b's first request did not wait behind conn_a's.
+    assert clock.now == 0.5
@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+import dagster as dg
+import pandas as pd
+import pytest
+
+from common.types.records import ContactRecord
+from dagster_ar.defs.landing import ReplayConfig, extract_frame
+from dagster_ar.defs.resources.landing import LandingZoneResource
+
+
+@pytest.fixture
+def landing(tmp_path) -> LandingZoneResource:
+    resource = LandingZoneResource(base_dir=str(tmp_path))
+    resource.setup_for_execution(dg.build_init_resource_context())
+    return resource
+
+
+def land(landing: LandingZoneResource, tenant: str, label: str, ids: list[str]):
+    pages = [[{"id": id_, "name": f"{tenant} {id_}"} for id_ in ids]]
+    for _ in landing.land_pages(tenant, "customers", label, pages):
+        pass
+
+
+def replay(landing: LandingZoneResource, tenant: str, label: str | None = None):
+    today = datetime.now(timezone.utc).date().isoformat()
+    frames = extract_frame(
+        dg.build_asset_context(),
+        ReplayConfig(replay_date=today),
+        landing,
+        "customers",
+        iter(()),
+        ContactRecord,
+        tenant,
+        label=label,
+    )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_replay_reads_only_the_tenants_files(landing):
+    land(landing, "conn_a", "backfill", ["a1", "a2"])
+    land(landing, "conn_b", "backfill", ["b1"])
+
+    customers = replay(landing, "conn_a")
+
+    assert customers["id"].tolist() == ["a1", "a2"]
+    assert customers["tenant"].unique().tolist() == ["conn_a"]
+
+
+def test_replay_reads_only_the_label(landing):
+    land(landing, "conn_a", "backfill", ["a1"])
+    land(landing, "conn_a", "2025-03-02", ["a2"])
+    land(landing, "conn_b", "backfill", ["b1"])
+
+    customers = replay(landing, "conn_a", label="backfill")
+
+    assert customers["id"].tolist() == ["a1"]
+
+
+def test_replay_of_nothing_landed_fails(landing):
+    land(landing, "conn_b", "backfill", ["b1"])
+
+    with pytest.raises(FileNotFoundError):
+        replay(landing, "conn_a", label="backfill")
@@ -0,0 +1,127 @@
+import pandas as pd
+
+from common.db.customers import customer_staging_types
+from common.db.invoices import invoice_staging_types
+from common.db.payments import payment_staging_types
+from dagster_ar.defs.loaders import upsert_customers, upsert_invoices, upsert_payments
+from dagster_ar.defs.transforms import age_invoice_chunks
+
+
+def test_invoices_are_copied_chunk_by_chunk(database, conn, extracted_invoices):
+    chunks = age_invoice_chunks(
+        [
+            extracted_invoices(["a", "b"], total_amount=10.5),
+            extracted_invoices(["c"], total_amount=1.0),
+        ],
+        pd.Series(dtype="int64"),
+    )
+
+    loaded = upsert_invoices(database, conn, chunks, "invoices_staging")
+
+    assert loaded == 3
+    staged = conn.copied["invoices_staging"]
+    assert [chunk["invoice_id"].tolist() for chunk in staged] == [["a", "b"], ["c"]]
+    assert all(list(chunk.columns) == list(invoice_staging_types) for chunk in staged)
+    # Amounts are staged as cents and only converted back in the UPSERT.
+    assert staged[0]["total_amount"].tolist() == [1050, 1050]
+
+
+def test_invoices_are_merged_after_their_placeholder_customers(
+    database, conn, extracted_invoices
+):
+    chunks = age_invoice_chunks([extracted_invoices(["a"])], pd.Series(dtype="int64"))
+
+    upsert_invoices(database, conn, chunks, "invoices_staging")
+
+    create, placeholders, upsert, balances = conn.statements
+    assert create.startswith("CREATE TEMP TABLE invoices_staging (")
+    assert create.endswith("ON COMMIT DROP")
+    assert all(
+        f"{column} {type_}" in create
+        for column, type_ in invoice_staging_types.items()
+    )
+    assert placeholders.startswith("INSERT INTO customers")
+    assert "'[Unknown Customer]'" in placeholders
+    assert "ON CONFLICT (id) DO NOTHING" in placeholders
+    assert upsert.startswith("INSERT INTO invoices")
+    assert "SELECT DISTINCT ON (invoice_id)" in upsert
+    assert "ORDER BY invoice_id ON CONFLICT (invoice_id) DO UPDATE" in upsert
+    assert "status = EXCLUDED.status" in upsert
+    assert balances.startswith("UPDATE invoices")
+    assert "FROM (SELECT DISTINCT invoice_id FROM invoices_staging)" in balances
+
+
+def test_no_invoices_stage_nothing(database, conn):
+    assert upsert_invoices(database, conn, iter(()), "invoices_staging") == 0
+    assert conn.copied == {}
+    # Only the empty staging table is created; nothing is merged.
+    [create] = conn.statements
+    assert create.startswith("CREATE TEMP TABLE invoices_staging")
+
+
+def test_customer_flags_default_when_missing(database, conn):
+    customers = pd.DataFrame(
+        {
+            "id": ["c1", "c2"],
+            "name": ["Acme", "Globex"],
+            "company_name": ["Acme Ltd", None],
+            "is_active": [None, False],
+            "is_supplier": [None, True],
+            "tenant": ["conn_a", "conn_a"],
+        }
+    )
+
+    upsert_customers(database, conn, customers)
+
+    [staged] = conn.copied["customers_staging"]
+    assert list(staged.columns) == list(customer_staging_types)
+    assert staged["is_active"].tolist() == [True, False]
+    assert staged["is_supplier"].tolist() == [False, True]
+
+
+def test_customers_only_replace_placeholders(database, conn):
+    customers = pd.DataFrame({column: [None] for column in customer_staging_types})
+
+    upsert_customers(database, conn, customers)
+
+    create, upsert = conn.statements
+    assert create.startswith("CREATE TEMP TABLE customers_staging (")
+    assert "SELECT DISTINCT ON (id)" in upsert
+    assert "ORDER BY id ON CONFLICT (id) DO UPDATE" in upsert
+    assert "WHERE customers.name = '[Unknown Customer]'" in upsert
+
+
+def test_payments_are_staged_with_their_staging_columns(database, conn):
+    payments = pd.DataFrame(
+        {column: [None] for column in payment_staging_types}
+    ).assign(payment_id="p1", total_amount=40.25, extra="dropped")
+
+    upsert_payments(database, conn, payments, "payments_staging")
+
+    [staged] = conn.copied["payments_staging"]
+    assert list(staged.columns) == list(payment_staging_types)
+    assert staged["total_amount"].tolist() == [40.25]
+
+
+def test_payments_refresh_the_invoices_they_move_between(database, conn):
+    payments = pd.DataFrame({column: [None] for column in payment_staging_types})
+
+    upsert_payments(database, conn, payments, "payments_staging")
+
+    create, create_changed, previous, upsert, balances = conn.statements
+    assert create.startswith("CREATE TEMP TABLE payments_staging (")
+    assert create_changed.startswith(
+        "CREATE TEMP TABLE payments_staging_invoices (invoice_id uuid)"
+    )
+    # The invoices payments are moved away from, then those they now pay.
+    assert previous.startswith("INSERT INTO payments_staging_invoices")
+    assert "p.invoice_id IS DISTINCT FROM s.invoice_id" in previous
+    assert "SELECT DISTINCT ON (s.payment_id)" in upsert
+    assert "ON CONFLICT (payment_id) DO UPDATE" in upsert
+    assert ") IS DISTINCT FROM (" in upsert
+    assert upsert.endswith(
+        "INSERT INTO payments_staging_invoices (invoice_id) "
+        "SELECT invoice_id FROM upserted WHERE invoice_id IS NOT NULL;"
+    )
+    assert balances.startswith("UPDATE invoices")
+    assert "FROM payments_staging_invoices" in balances
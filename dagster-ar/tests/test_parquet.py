@@ -0,0 +1,174 @@
+import dagster as dg
+import pandas as pd
+import pytest
+
+from dagster_ar.defs.resources.parquet import (
+    CHUNK_SIZE,
+    COLUMNS,
+    ParquetIOManager,
+    PartitionedFrames,
+)
+
+letters = dg.StaticPartitionsDefinition(["a", "b", "c"])
+
+
+def frame(start: int, stop: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"id": [str(index) for index in range(start, stop)], "amount": range(start, stop)}
+    )
+
+
+def partition_range(start: str, end: str) -> dict[str, str]:
+    """Run tags materializing the partitions `start` to `end` in one run."""
+    return {
+        "dagster/asset_partition_range_start": start,
+        "dagster/asset_partition_range_end": end,
+    }
+
+
+@pytest.fixture
+def resources(tmp_path) -> dict:
+    return {"parquet_io_manager": ParquetIOManager(base_dir=str(tmp_path))}
+
+
+def test_chunked_output_round_trips(resources):
+    received = {}
+
+    @dg.asset(io_manager_key="parquet_io_manager")
+    def chunked():
+        return dg.Output(iter([frame(0, 3), frame(3, 5)]))
+
+    @dg.asset(
+        ins={"chunks": dg.AssetIn("chunked", metadata={CHUNK_SIZE: 2})},
+        io_manager_key="parquet_io_manager",
+    )
+    def rechunked(chunks) -> None:
+        received["chunks"] = [chunk["id"].tolist() for chunk in chunks]
+
+    @dg.asset(
+        ins={"whole": dg.AssetIn("chunked", metadata={COLUMNS: ["amount"]})},
+        io_manager_key="parquet_io_manager",
+    )
+    def whole(whole: pd.DataFrame) -> None:
+        received["whole"] = whole
+
+    result = dg.materialize([chunked, rechunked, whole], resources=resources)
+
+    assert result.success
+    assert received["chunks"] == [["0", "1"], ["2", "3"], ["4"]]
+    assert received["whole"].columns.tolist() == ["amount"]
+    assert received["whole"]["amount"].tolist() == [0, 1, 2, 3, 4]
+    [materialization] = result.asset_materializations_for_node("chunked")
+    assert materialization.metadata["num_rows"].value == 5
+
+
+def test_multi_partition_output_round_trips(resources):
+    received = {}
+
+    @dg.asset(
+        partitions_def=letters,
+        io_manager_key="parquet_io_manager",
+        backfill_policy=dg.BackfillPolicy.single_run(),
+    )
+    def lettered(context: dg.AssetExecutionContext) -> dict:
+        # One partition as a frame, another as chunks.
+        return {"a": frame(0, 2), "b": iter([frame(2, 3), frame(3, 4)])}
+
+    @dg.asset(
+        partitions_def=letters,
+        ins={"lettered": dg.AssetIn("lettered")},
+        io_manager_key="parquet_io_manager",
+        backfill_policy=dg.BackfillPolicy.single_run(),
+    )
+    def read_back(context: dg.AssetExecutionContext, lettered: dict) -> None:
+        received.update(
+            {key: data["id"].tolist() for key, data in lettered.items()}
+        )
+
+    result = dg.materialize(
+        [lettered, read_back],
+        resources=resources,
+        tags=partition_range("a", "b"),
+    )
+
+    assert result.success
+    assert received == {"a": ["0", "1"], "b": ["2", "3"]}
+
+
+def test_output_missing_a_partition_fails(resources):
+    @dg.asset(
+        partitions_def=letters,
+        io_manager_key="parquet_io_manager",
+        backfill_policy=dg.BackfillPolicy.single_run(),
+    )
+    def lettered(context: dg.AssetExecutionContext) -> dict:
+        return {"a": frame(0, 2)}
+
+    with pytest.raises(dg.DagsterInvariantViolationError):
+        dg.materialize(
+            [lettered],
+            resources=resources,
+            tags=partition_range("a", "b"),
+        )
+
+
+def test_partitioned_stream_is_written_as_it_is_read(resources):
+    received = {}
+    pulled = []
+
+    def pages():
+        for start in (0, 2):
+            pulled.append(start)
+            yield {"a": frame(start, start + 1), "b": frame(start + 1, start + 2)}
+
+    @dg.asset(
+        partitions_def=letters,
+        io_manager_key="parquet_io_manager",
+        backfill_policy=dg.BackfillPolicy.single_run(),
+    )
+    def lettered(context: dg.AssetExecutionContext) -> PartitionedFrames:
+        return PartitionedFrames(pages())
+
+    @dg.asset(
+        partitions_def=letters,
+        ins={"lettered": dg.AssetIn("lettered", metadata={CHUNK_SIZE: 10})},
+        io_manager_key="parquet_io_manager",
+        backfill_policy=dg.BackfillPolicy.single_run(),
+    )
+    def read_back(context: dg.AssetExecutionContext, lettered: dict) -> None:
+        received.update(
+            {
+                key: [chunk["id"].tolist() for chunk in chunks]
+                for key, chunks in lettered.items()
+            }
+        )
+
+    result = dg.materialize(
+        [lettered, read_back],
+        resources=resources,
+        tags=partition_range("a", "c"),
+    )
+
+    assert result.success
+    assert pulled == [0, 2]
+    # Every page is a row group of its partition's file; "c" got no rows.
+    assert received == {"a": [["0", "2"]], "b": [["1", "3"]], "c": []}
+    [materialization, *_] = result.asset_materializations_for_node("lettered")
+    assert materialization.metadata["num_rows_in_run"].value == 4
+
+
+def test_partitioned_stream_outside_the_step_fails(resources):
+    @dg.asset(
+        partitions_def=letters,
+        io_manager_key="parquet_io_manager",
+        backfill_policy=dg.BackfillPolicy.single_run(),
+    )
+    def lettered(context: dg.AssetExecutionContext) -> PartitionedFrames:
+        return PartitionedFrames(iter([{"c": frame(0, 1)}]))
+
+    with pytest.raises(dg.DagsterInvariantViolationError):
+        dg.materialize(
+            [lettered],
+            resources=resources,
+            tags=partition_range("a", "b"),
+        )
@@ -0,0 +1,67 @@
+import dagster as dg
+import pandas as pd
+
+from dagster_ar.defs.assets.partitioned_invoices import (
+    iter_aging_buckets,
+    split_by_aging_bucket,
+)
+
+
+def due_days_ago(*days: int) -> pd.DataFrame:
+    today = pd.Timestamp.now(tz="UTC")
+    return pd.DataFrame(
+        {
+            "id": [f"due-{day}" for day in days],
+            "due_at": [(today - pd.Timedelta(days=day)).isoformat() for day in days],
+        }
+    )
+
+
+def test_listing_is_split_into_the_runs_buckets():
+    invoices = due_days_ago(-5, 10, 45, 200)
+
+    buckets = split_by_aging_bucket(invoices, ["0", "1", "5"])
+
+    assert {key: bucket["id"].tolist() for key, bucket in buckets.items()} == {
+        "0": ["due--5"],
+        "1": ["due-10"],
+        "5": ["due-200"],
+    }
+
+
+def test_buckets_without_invoices_are_empty():
+    buckets = split_by_aging_bucket(due_days_ago(10), ["3"])
+
+    assert buckets["3"].empty
+    assert list(buckets["3"].columns) == ["id", "due_at"]
+
+
+
+def test_pages_are_split_one_at_a_time():
+    pulled = []
+
+    def frames():
+        for days in ([10, 45], [20]):
+            pulled.append(days)
+            yield due_days_ago(*days)
+
+    aging_filters = {
+        "1": {"due_date_from": "2025-01-01", "due_date_to": "2025-01-30"},
+        "2": {"due_date_from": "2024-12-01", "due_date_to": "2024-12-31"},
+    }
+    buckets = iter_aging_buckets(
+        dg.build_asset_context(), frames(), aging_filters
+    )
+
+    first = next(buckets)
+    assert pulled == [[10, 45]]
+    assert {key: bucket["id"].tolist() for key, bucket in first.items()} == {
+        "1": ["due-10"],
+        "2": ["due-45"],
+    }
+
+    [second] = list(buckets)
+    assert {key: bucket["id"].tolist() for key, bucket in second.items()} == {
+        "1": ["due-20"],
+        "2": [],
+    }
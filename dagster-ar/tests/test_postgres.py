@@ -0,0 +1,279 @@
+"""
+Runs the loaders' SQL against a real PostgreSQL server. Set TEST_POSTGRES_URL,
+e.g. `postgresql://ar:ar@localhost:5432/ar`, to run them; every test works in
+a throwaway schema that is dropped afterwards.
+"""
+
+import os
+import uuid
+from contextlib import contextmanager
+
+import dagster as dg
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from dagster_ar.defs.loaders import upsert_customers, upsert_invoices, upsert_payments
+from dagster_ar.defs.resources.database import DatabaseResource
+from dagster_ar.defs.transforms import age_invoice_chunks
+
+pytestmark = [
+    pytest.mark.postgres,
+    pytest.mark.skipif(
+        not os.environ.get("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL is not set"
+    ),
+]
+
+# The tables the loaders write, as the Django models define them
+SCHEMA_DDL = """
+    CREATE TABLE customers (
+        id uuid PRIMARY KEY,
+        customer_id uuid UNIQUE,
+        name varchar(255) NOT NULL,
+        company_name varchar(255),
+        tax_exemption varchar(100),
+        currency varchar(10),
+        is_supplier boolean,
+        is_active boolean NOT NULL,
+        tenant varchar(100) NOT NULL DEFAULT '',
+        created_at timestamptz NOT NULL,
+        updated_at timestamptz NOT NULL
+    );
+    CREATE TABLE invoices (
+        invoice_id uuid PRIMARY KEY,
+        customer_id uuid REFERENCES customers (id),
+        invoice_number varchar(100) NOT NULL,
+        currency varchar(3),
+        total_amount numeric(10, 2),
+        paid_amount numeric(10, 2),
+        balance_amount numeric(10, 2),
+        tax_amount numeric(10, 2),
+        created_at timestamptz NOT NULL,
+        updated_at timestamptz NOT NULL,
+        due_at timestamptz NOT NULL,
+        days_overdue integer NOT NULL,
+        aging_bucket integer NOT NULL,
+        invoice_at timestamptz NOT NULL,
+        posted_at timestamptz,
+        status varchar(50) NOT NULL,
+        type varchar(50) NOT NULL,
+        notes text NOT NULL,
+        tenant varchar(100) NOT NULL DEFAULT ''
+    );
+    CREATE TABLE payments (
+        id uuid PRIMARY KEY,
+        payment_id uuid NOT NULL UNIQUE,
+        customer_id uuid REFERENCES customers (id) ON DELETE SET NULL,
+        invoice_id uuid REFERENCES invoices (invoice_id) ON DELETE SET NULL,
+        account_id uuid,
+        total_amount numeric(15, 2) NOT NULL,
+        currency varchar(10) NOT NULL,
+        tenant varchar(100) NOT NULL DEFAULT '',
+        created_at timestamptz NOT NULL,
+        updated_at timestamptz NOT NULL
+    );
+"""
+
+ACME = "c0000000-0000-0000-0000-000000000001"
+GLOBEX = "c0000000-0000-0000-0000-000000000002"
+INVOICE_A = "a0000000-0000-0000-0000-00000000000a"
+INVOICE_B = "a0000000-0000-0000-0000-00000000000b"
+INVOICE_C = "a0000000-0000-0000-0000-00000000000c"
+PAYMENT_1 = "b0000000-0000-0000-0000-000000000001"
+PAYMENT_2 = "b0000000-0000-0000-0000-000000000002"
+
+
+class ScratchSchema:
+    """A throwaway schema every transaction of a test reads and writes."""
+
+    def __init__(self, database: DatabaseResource, name: str):
+        self.database = database
+        self.name = name
+
+    @contextmanager
+    def transaction(self):
+        with self.database.get_transaction() as conn:
+            conn.execute(text(f"SET LOCAL search_path TO {self.name}"))
+            yield conn
+
+    def rows(self, query: str) -> list[tuple]:
+        with self.transaction() as conn:
+            return [tuple(row) for row in conn.execute(text(query))]
+
+
+@pytest.fixture
+def postgres():
+    url = make_url(os.environ["TEST_POSTGRES_URL"])
+    database = DatabaseResource(
+        user=url.username,
+        password=url.password or "",
+        host=url.host,
+        port=url.port or 5432,
+        database=url.database,
+    )
+    database.setup_for_execution(dg.build_init_resource_context())
+    schema = ScratchSchema(database, f"dagster_ar_test_{uuid.uuid4().hex[:12]}")
+
+    with database.get_transaction() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema.name}"))
+    with schema.transaction() as conn:
+        conn.execute(text(SCHEMA_DDL))
+
+    yield schema
+
+    with database.get_transaction() as conn:
+        conn.execute(text(f"DROP SCHEMA {schema.name} CASCADE"))
+    database.teardown_after_execution(dg.build_init_resource_context())
+
+
+def customers(*names: tuple[str, str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [id_ for id_, _ in names],
+            "name": [name for _, name in names],
+            "company_name": [f"{name} Ltd" for _, name in names],
+            "is_active": None,
+            "is_supplier": None,
+            "tenant": "conn_a",
+        }
+    )
+
+
+def payments(*paid: tuple[str, str, float, str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "payment_id": [payment_id for payment_id, _, _, _ in paid],
+            "customer_id": ACME,
+            "invoice_id": [invoice_id for _, invoice_id, _, _ in paid],
+            "account_id": None,
+            "total_amount": [amount for _, _, amount, _ in paid],
+            "currency": "USD",
+            "tenant": "conn_a",
+            "created_at": "2025-03-01T00:00:00Z",
+            "updated_at": [updated_at for _, _, _, updated_at in paid],
+        }
+    )
+
+
+def load(
+    postgres: ScratchSchema,
+    new_customers: pd.DataFrame,
+    invoice_chunks: list[pd.DataFrame],
+    new_payments: pd.DataFrame,
+) -> None:
+    """Loads one run's customers, invoices and payments in the assets' order."""
+    database = postgres.database
+    with postgres.transaction() as conn:
+        upsert_customers(database, conn, new_customers)
+    with postgres.transaction() as conn:
+        aged = age_invoice_chunks(invoice_chunks, pd.Series(dtype="int64"))
+        upsert_invoices(database, conn, aged, "invoices_staging")
+    with postgres.transaction() as conn:
+        upsert_payments(database, conn, new_payments, "payments_staging")
+
+
+def invoices(postgres: ScratchSchema) -> dict[str, tuple]:
+    rows = postgres.rows(
+        "SELECT invoice_id, customer_id, status, total_amount, balance_amount "
+        "FROM invoices ORDER BY invoice_id"
+    )
+    return {
+        str(invoice_id): (str(customer_id), status, float(total), float(balance))
+        for invoice_id, customer_id, status, total, balance in rows
+    }
+
+
+@pytest.fixture
+def extracted(extracted_invoices):
+    """Extracted invoices with every column the invoices table requires."""
+
+    def build(ids, **columns) -> pd.DataFrame:
+        required = {
+            "contact_id": ACME,
+            "invoice_at": "2025-01-01T00:00:00Z",
+            "notes": "",
+        }
+        return extracted_invoices(ids, **{**required, **columns})
+
+    return build
+
+
+def test_overlapping_runs_merge_into_one_ledger(postgres, extracted):
+    # The first run lists invoice A twice, as offset pages do when the
+    # listing shifts, and B for a customer that was not extracted.
+    load(
+        postgres,
+        customers((ACME, "Acme")),
+        [
+            extracted([INVOICE_A, INVOICE_B], contact_id=[ACME, GLOBEX]),
+            extracted([INVOICE_A]),
+        ],
+        payments((PAYMENT_1, INVOICE_A, 40.25, "2025-03-01T00:00:00Z")),
+    )
+
+    assert invoices(postgres) == {
+        INVOICE_A: (ACME, "AUTHORIZED", 100.0, 59.75),
+        INVOICE_B: (GLOBEX, "AUTHORIZED", 100.0, 100.0),
+    }
+    assert postgres.rows(f"SELECT name FROM customers WHERE id = '{GLOBEX}'") == [
+        ("[Unknown Customer]",)
+    ]
+
+    # The next run re-lists B, paid in full after a re-total, a new invoice C,
+    # the unchanged payment on A, and B's payment.
+    # Built afresh for every load, since aging converts the chunks in place.
+    def second_run():
+        return (
+            customers((GLOBEX, "Globex")),
+            [
+                extracted(
+                    [INVOICE_B], contact_id=GLOBEX, total_amount=60.0, status="PAID"
+                ),
+                extracted([INVOICE_C], total_amount=30.0),
+            ],
+            payments(
+                (PAYMENT_1, INVOICE_A, 40.25, "2025-03-01T00:00:00Z"),
+                (PAYMENT_2, INVOICE_B, 60.0, "2025-03-02T00:00:00Z"),
+            ),
+        )
+
+    load(postgres, *second_run())
+
+    expected = {
+        INVOICE_A: (ACME, "AUTHORIZED", 100.0, 59.75),
+        INVOICE_B: (GLOBEX, "PAID", 60.0, 0.0),
+        INVOICE_C: (ACME, "AUTHORIZED", 30.0, 30.0),
+    }
+    assert invoices(postgres) == expected
+    assert postgres.rows(f"SELECT name FROM customers WHERE id = '{GLOBEX}'") == [
+        ("Globex",)
+    ]
+
+    # Replaying the same run changes nothing, and leaves unchanged payments alone.
+    payments_before = postgres.rows("SELECT * FROM payments ORDER BY payment_id")
+    load(postgres, *second_run())
+
+    assert invoices(postgres) == expected
+    assert postgres.rows("SELECT * FROM payments ORDER BY payment_id") == payments_before
+
+
+def test_a_moved_payment_refreshes_both_invoices(postgres, extracted):
+    load(
+        postgres,
+        customers((ACME, "Acme")),
+        [extracted([INVOICE_A, INVOICE_C])],
+        payments((PAYMENT_1, INVOICE_A, 40.0, "2025-03-01T00:00:00Z")),
+    )
+
+    with postgres.transaction() as conn:
+        upsert_payments(
+            postgres.database,
+            conn,
+            payments((PAYMENT_1, INVOICE_C, 40.0, "2025-03-02T00:00:00Z")),
+            "payments_staging",
+        )
+
+    assert {
+        invoice_id: balance for invoice_id, (*_, balance) in invoices(postgres).items()
+    } == {INVOICE_A: 100.0, INVOICE_C: 60.0}
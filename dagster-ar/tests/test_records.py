@@ -0,0 +1,49 @@
+import pytest
+
+from common.types.records import ContactRecord, InvoiceRecord, PaymentRecord, decode_page
+
+
+def test_decode_page_keeps_only_record_fields():
+    [invoice] = decode_page(
+        [
+            {
+                "id": "inv-1",
+                "total_amount": 12,
+                "status": "AUTHORIZED",
+                "type": "BILL",
+                "lineitems": [{"id": "line-1"}],
+            }
+        ],
+        InvoiceRecord,
+    )
+
+    assert invoice.id == "inv-1"
+    assert invoice.total_amount == 12.0
+    assert isinstance(invoice.total_amount, float)
+    assert invoice.status == "AUTHORIZED"
+    assert invoice.due_at is None
+    assert not hasattr(invoice, "lineitems")
+
+
+@pytest.mark.parametrize(
+    "record_type, payload, field",
+    [
+        (InvoiceRecord, {"id": "inv-1", "total_amount": "12.00"}, "total_amount"),
+        (InvoiceRecord, {"id": "inv-1", "status": "LOST"}, "status"),
+        (ContactRecord, {"id": "con-1", "is_active": "yes"}, "is_active"),
+        (PaymentRecord, {"id": "pay-1", "invoice_id": 7}, "invoice_id"),
+    ],
+)
+def test_decode_page_names_the_invalid_field(record_type, payload, field):
+    with pytest.raises(ValueError) as error:
+        decode_page([payload], record_type)
+
+    message = str(error.value)
+    assert record_type.__name__ in message
+    assert repr(payload["id"]) in message
+    assert repr(field) in message
+
+
+def test_decode_page_rejects_booleans_as_amounts():
+    with pytest.raises(ValueError, match="'total_amount'"):
+        decode_page([{"id": "pay-1", "total_amount": True}], PaymentRecord)
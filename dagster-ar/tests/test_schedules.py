@@ -0,0 +1,68 @@
+import uuid
+from datetime import datetime, timezone
+
+import dagster as dg
+import pytest
+
+from dagster_ar.defs.schedules import daily_update_schedule, tenant_ingestion_schedule
+
+# The tick that ingests 2025-03-09 and catches up on the six days before it
+tick = datetime(2025, 3, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def instance():
+    with dg.instance_for_test() as instance:
+        yield instance
+
+
+def add_run(
+    instance: dg.DagsterInstance,
+    job_name: str,
+    partition_key: str,
+    status: dg.DagsterRunStatus = dg.DagsterRunStatus.STARTED,
+) -> None:
+    instance.add_run(
+        dg.DagsterRun(
+            job_name=job_name,
+            run_id=str(uuid.uuid4()),
+            status=status,
+            tags={"dagster/partition": partition_key},
+        )
+    )
+
+
+def requested(schedule, instance: dg.DagsterInstance) -> list[str]:
+    context = dg.build_schedule_context(instance=instance, scheduled_execution_time=tick)
+    return [request.partition_key for request in schedule(context)]
+
+
+def test_catch_up_requests_every_unloaded_day(instance):
+
+    assert requested(daily_update_schedule, instance) == [
+        f"2025-03-0{day}" for day in range(3, 10)
+    ]
+
+
+def test_catch_up_skips_days_still_loading(instance):
+    add_run(instance, "daily_update_job", "2025-03-05")
+    add_run(instance, "daily_update_job", "2025-03-09")
+    # Finished runs that never loaded their day are retried.
+    add_run(instance, "daily_update_job", "2025-03-06", dg.DagsterRunStatus.FAILURE)
+
+    days = requested(daily_update_schedule, instance)
+
+    assert "2025-03-05" not in days and "2025-03-09" not in days
+    assert "2025-03-06" in days
+    assert len(days) == 5
+
+
+def test_tenant_catch_up_skips_tenant_days_still_loading(instance):
+    instance.add_dynamic_partitions("tenants", ["conn_a", "conn_b"])
+    add_run(instance, "tenant_ingestion_job", "2025-03-08|conn_a")
+
+    partition_keys = requested(tenant_ingestion_schedule, instance)
+
+    assert "2025-03-08|conn_a" not in partition_keys
+    assert "2025-03-08|conn_b" in partition_keys
+    assert len(partition_keys) == 13
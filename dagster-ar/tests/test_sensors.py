@@ -0,0 +1,42 @@
+import uuid
+
+import dagster as dg
+
+from dagster_ar.defs.sensors import aging_summary_sensor
+
+
+def add_run(instance: dg.DagsterInstance, job_name: str, status: dg.DagsterRunStatus) -> str:
+    run = dg.DagsterRun(job_name=job_name, run_id=str(uuid.uuid4()), status=status)
+    instance.add_run(run)
+    return run.run_id
+
+
+def evaluate(instance: dg.DagsterInstance):
+    return aging_summary_sensor(dg.build_sensor_context(instance=instance))
+
+
+def test_nothing_to_refresh_before_any_ingestion():
+    instance = dg.DagsterInstance.ephemeral()
+
+    assert isinstance(evaluate(instance), dg.SkipReason)
+
+
+def test_refresh_waits_for_runs_still_in_progress():
+    instance = dg.DagsterInstance.ephemeral()
+    add_run(instance, "tenant_ingestion_job", dg.DagsterRunStatus.SUCCESS)
+    add_run(instance, "tenant_ingestion_job", dg.DagsterRunStatus.STARTED)
+
+    assert isinstance(evaluate(instance), dg.SkipReason)
+
+
+def test_settled_runs_are_refreshed_once():
+    instance = dg.DagsterInstance.ephemeral()
+    add_run(instance, "tenant_ingestion_job", dg.DagsterRunStatus.FAILURE)
+    last_run_id = add_run(instance, "daily_update_job", dg.DagsterRunStatus.SUCCESS)
+    # Runs of other jobs, such as the refresh itself, are not waited for.
+    add_run(instance, "aging_summary_job", dg.DagsterRunStatus.STARTED)
+
+    request = evaluate(instance)
+
+    assert isinstance(request, dg.RunRequest)
+    assert request.run_key == last_run_id
@@ -0,0 +1,90 @@
+import io
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from dagster_ar.defs.resources.unified import UnifiedAccountingResource
+
+pytest.importorskip("ijson")
+
+
+class ListingResponse:
+    """A response to one page request, as a parsed body and as a raw byte stream."""
+
+    def __init__(self, records: list[dict]):
+        self.records = records
+        self.raw = io.BytesIO(json.dumps(records).encode())
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> list[dict]:
+        return self.records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class ListingSession:
+    """Serves `num_records` invoices by offset, recording the offset of every request."""
+
+    def __init__(self, num_records: int):
+        self.num_records = num_records
+        self.requested_offsets: list[int] = []
+
+    def get(self, url, headers=None, timeout=None, stream=False) -> ListingResponse:
+        query = parse_qs(urlsplit(url).query)
+        offset, limit = int(query["offset"][0]), int(query["limit"][0])
+        self.requested_offsets.append(offset)
+        stop = min(offset + limit, self.num_records)
+        return ListingResponse(
+            [{"id": str(index), "total_amount": index + 0.5} for index in range(offset, stop)]
+        )
+
+
+def list_invoices(
+    session: ListingSession, stream_decode: bool = True
+) -> list[list[dict]]:
+    resource = UnifiedAccountingResource(
+        base_url="https://api.example.com/",
+        conn_id="conn",
+        api_key="key",
+        page_size=5,
+        stream_decode=stream_decode,
+        stream_chunk_size=2,
+    )
+    resource._session = session
+    return list(resource.iter_invoice_pages())
+
+
+def test_streamed_pages_are_chunked():
+    session = ListingSession(12)
+
+    chunks = list_invoices(session)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1, 2, 2, 1, 2]
+    assert session.requested_offsets == [0, 5, 10]
+
+
+def test_streamed_walk_stops_after_a_short_page():
+    session = ListingSession(10)
+
+    chunks = list_invoices(session)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1, 2, 2, 1]
+    # The empty page after the last full one ends the walk.
+    assert session.requested_offsets == [0, 5, 10]
+
+
+def test_streamed_records_match_buffered_pages():
+    streamed = list_invoices(ListingSession(12))
+    buffered = list_invoices(ListingSession(12), stream_decode=False)
+
+    assert [record for chunk in streamed for record in chunk] == [
+        record for page in buffered for record in page
+    ]
+    assert isinstance(streamed[0][0]["total_amount"], float)
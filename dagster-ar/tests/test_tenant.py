@@ -0,0 +1,129 @@
+from typing import ClassVar
+
+import dagster as dg
+import pandas as pd
+import pytest
+
+from dagster_ar.defs.assets.tenant_invoices import tenant_assets
+from dagster_ar.defs.loaders import upsert_customers, upsert_invoices, upsert_payments
+from dagster_ar.defs.resources.landing import LandingZoneResource
+from dagster_ar.defs.resources.parquet import ParquetIOManager
+from dagster_ar.defs.resources.unified import UnifiedAccountingResource
+from dagster_ar.defs.transforms import age_invoice_chunks, total_paid_by_invoice
+
+
+def test_age_invoices_keeps_the_tenant(extracted_invoices):
+    payments = pd.DataFrame(
+        {"invoice_id": ["11111111-1111-1111-1111-111111111111"], "total_amount": [40.0]}
+    )
+
+    [aged] = age_invoice_chunks(
+        [extracted_invoices(tenant="conn_a")], total_paid_by_invoice(payments)
+    )
+
+    assert isinstance(aged["tenant"].dtype, pd.CategoricalDtype)
+    assert aged["tenant"].astype(str).tolist() == ["conn_a"]
+    assert aged["balance_amount"].tolist() == [6000]
+
+
+def test_upsert_invoices_loads_the_tenant(database, conn, extracted_invoices):
+    aged = age_invoice_chunks(
+        [extracted_invoices(tenant="conn_a")], pd.Series(dtype="int64")
+    )
+
+    upsert_invoices(database, conn, aged, "invoices_staging")
+
+    [staged] = conn.copied["invoices_staging"]
+    assert staged["tenant"].astype(str).tolist() == ["conn_a"]
+    assert staged["customer_id"].tolist() == ["22222222-2222-2222-2222-222222222222"]
+
+
+def test_upsert_payments_loads_the_tenant(database, conn):
+    payments = pd.DataFrame(
+        {
+            "payment_id": ["33333333-3333-3333-3333-333333333333"],
+            "customer_id": ["22222222-2222-2222-2222-222222222222"],
+            "invoice_id": ["11111111-1111-1111-1111-111111111111"],
+            "account_id": [None],
+            "total_amount": [40.0],
+            "currency": ["USD"],
+            "tenant": ["conn_a"],
+            "created_at": ["2025-01-02T00:00:00Z"],
+            "updated_at": ["2025-01-02T00:00:00Z"],
+        }
+    )
+
+    upsert_payments(database, conn, payments, "payments_staging")
+
+    [staged] = conn.copied["payments_staging"]
+    assert staged["tenant"].tolist() == ["conn_a"]
+
+
+def test_upsert_customers_stages_the_tenant(database, conn):
+    customers = pd.DataFrame(
+        {
+            "id": ["22222222-2222-2222-2222-222222222222"],
+            "name": ["Acme"],
+            "company_name": ["Acme Ltd"],
+            "is_active": [True],
+            "is_supplier": [None],
+            "tenant": ["conn_a"],
+        }
+    )
+
+    upsert_customers(database, conn, customers)
+
+    [staged] = conn.copied["customers_staging"]
+    assert staged["tenant"].tolist() == ["conn_a"]
+    assert staged["is_supplier"].tolist() == [False]
+
+
+class TenantAccountingResource(UnifiedAccountingResource):
+    """Serves one invoice per connection, recording which connection each request read."""
+
+    requested_conn_ids: ClassVar[list[str]] = []
+
+    def _request(self, resource_url, endpoint_path, params=None, conn_id=None):
+        self.requested_conn_ids.append(conn_id)
+        return [
+            {
+                "id": f"{conn_id}-1",
+                "total_amount": 100.0,
+                "updated_at": "2025-03-02T12:00:00Z",
+            }
+        ]
+
+
+def test_tenant_extract_reads_and_lands_its_connection(tmp_path, database):
+    TenantAccountingResource.requested_conn_ids.clear()
+    instance = dg.DagsterInstance.ephemeral()
+    instance.add_dynamic_partitions("tenants", ["conn_a", "conn_b"])
+    resources = {
+        "unified_api": TenantAccountingResource(
+            base_url="https://api.example.com/", conn_id="default", api_key="key"
+        ),
+        "landing": LandingZoneResource(base_dir=str(tmp_path / "landing")),
+        "parquet_io_manager": ParquetIOManager(base_dir=str(tmp_path / "assets")),
+        # Required by the unselected load assets; never used.
+        "database": database,
+    }
+
+    for tenant in ["conn_a", "conn_b"]:
+        result = dg.materialize(
+            tenant_assets,
+            selection="extract_invoices_by_tenant",
+            partition_key=dg.MultiPartitionKey({"date": "2025-03-02", "tenant": tenant}),
+            resources=resources,
+            instance=instance,
+        )
+        assert result.success
+
+    assert TenantAccountingResource.requested_conn_ids == ["conn_a", "conn_b"]
+    for tenant in ["conn_a", "conn_b"]:
+        [landed] = (tmp_path / "landing" / tenant / "invoices").glob("*/*.ndjson.gz")
+        assert landed.name.endswith("-2025-03-02.ndjson.gz")
+
+    [a_path] = (tmp_path / "assets" / "extract_invoices_by_tenant").rglob("*conn_a*")
+    extracted = pd.read_parquet(a_path)
+    assert extracted["id"].tolist() == ["conn_a-1"]
+    assert extracted["tenant"].tolist() == ["conn_a"]
@@ -0,0 +1,54 @@
+import pandas as pd
+import pyarrow as pa
+
+from common.db.invoices import invoice_dtypes
+from dagster_ar.defs.transforms import age_invoice_chunks, total_paid_by_invoice
+
+
+def test_chunks_are_aged_one_for_one(extracted_invoices):
+    chunks = [
+        extracted_invoices(["a", "b"], due_at="2020-01-01"),
+        extracted_invoices(["c"], due_at="2020-01-01"),
+    ]
+    payments = pd.DataFrame({"invoice_id": ["a", "a"], "total_amount": [10.0, 15.5]})
+
+    aged = list(age_invoice_chunks(chunks, total_paid_by_invoice(payments)))
+
+    assert [chunk["invoice_id"].tolist() for chunk in aged] == [["a", "b"], ["c"]]
+    assert aged[0]["balance_amount"].tolist() == [7450, 10000]
+    assert aged[0]["aging_bucket"].tolist() == [5, 5]
+
+
+def test_chunks_are_aged_in_place(extracted_invoices):
+    chunk = extracted_invoices(["a"], due_at="2020-01-01")
+
+    [aged] = age_invoice_chunks([chunk], pd.Series(dtype="int64"))
+
+    assert aged is chunk
+
+
+def test_every_chunk_has_the_invoice_dtypes(extracted_invoices):
+    # The second chunk's optional columns are all missing, which must not
+    # change the Parquet schema it is written with.
+    chunks = [
+        extracted_invoices(["a"], due_at="2020-01-01", notes="paid late"),
+        extracted_invoices(["b"], due_at="2020-01-01", currency=None, tenant=None),
+    ]
+
+    aged = list(age_invoice_chunks(chunks, pd.Series(dtype="int64")))
+
+    schemas = [pa.Schema.from_pandas(chunk, preserve_index=False) for chunk in aged]
+    assert schemas[1].equals(schemas[0])
+    assert sorted(schemas[0].names) == sorted(invoice_dtypes)
+    assert aged[1]["status"].dtype == invoice_dtypes["status"]
+
+
+def test_chunks_outside_the_bucket_are_skipped(extracted_invoices):
+    chunks = [
+        extracted_invoices(["overdue"], due_at="2020-01-01"),
+        extracted_invoices(["current"], due_at="2999-01-01"),
+    ]
+
+    aged = list(age_invoice_chunks(chunks, pd.Series(dtype="int64"), aging_bucket=0))
+
+    assert [chunk["invoice_id"].tolist() for chunk in aged] == [["current"]]
@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import ClassVar
+
+import dagster as dg
+import pytest
+
+from dagster_ar.defs.resources.unified import (
+    UnifiedAccountingResource,
+    concurrent_extracts_tags,
+)
+
+
+class ListingResource(UnifiedAccountingResource):
+    """Serves `num_records` invoices by offset, recording the offset of every request."""
+
+    num_records: int = 0
+    requested_offsets: ClassVar[list[int]] = []
+
+    def _request(self, resource_url, endpoint_path, params=None, conn_id=None):
+        self.requested_offsets.append(params["offset"])
+        stop = min(params["offset"] + params["limit"], self.num_records)
+        return [{"id": str(index)} for index in range(params["offset"], stop)]
+
+
+def list_invoices(num_records: int, max_in_flight: int = 4) -> list[list[dict]]:
+    ListingResource.requested_offsets.clear()
+    resource = ListingResource(
+        base_url="https://api.example.com/",
+        conn_id="conn",
+        api_key="key",
+        page_size=2,
+        max_in_flight=max_in_flight,
+        num_records=num_records,
+    )
+    return list(resource.iter_invoice_pages())
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 4])
+def test_walk_stops_on_a_short_page(max_in_flight):
+    pages = list_invoices(5, max_in_flight)
+
+    assert [[record["id"] for record in page] for page in pages] == [
+        ["0", "1"],
+        ["2", "3"],
+        ["4"],
+    ]
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 4])
+def test_walk_stops_on_an_empty_page(max_in_flight):
+    pages = list_invoices(4, max_in_flight)
+
+    assert [len(page) for page in pages] == [2, 2]
+    assert 4 in ListingResource.requested_offsets
+
+
+def test_empty_listing_yields_no_pages():
+    assert list_invoices(0) == []
+    assert ListingResource.requested_offsets == [0]
+
+
+def test_short_listings_request_nothing_past_their_end():
+    list_invoices(3)
+
+    assert sorted(ListingResource.requested_offsets) == [0, 2]
+
+
+def test_long_listings_request_little_past_their_end():
+    pages = list_invoices(40)
+
+    assert sum(len(page) for page in pages) == 40
+    # 20 full pages and the empty one ending the walk, plus at most
+    # max_in_flight - 1 requests read ahead past it.
+    assert len(ListingResource.requested_offsets) <= 21 + 3
+
+
+def rate_limit_in_run(tags: dict[str, str]) -> float:
+    limits = {}
+
+    @dg.asset
+    def extract(unified_api: UnifiedAccountingResource) -> None:
+        limits["conn"] = unified_api._get_rate_limit("conn")
+
+    resource = UnifiedAccountingResource(
+        base_url="https://api.example.com/",
+        conn_id="conn",
+        api_key="key",
+        requests_per_second=6,
+    )
+    assert dg.materialize([extract], resources={"unified_api": resource}, tags=tags).success
+    return limits["conn"]
+
+
+def test_runs_tagged_with_concurrent_extracts_split_the_rate():
+    assert rate_limit_in_run(concurrent_extracts_tags(3)) == 2
+
+
+def test_other_runs_get_the_full_rate():
+    assert rate_limit_in_run({}) == 6
+
+
+class SlowListingResource(UnifiedAccountingResource):
+    """
+    Serves `num_records` invoices by offset, answering every third page first,
+    and records how many requests were outstanding as each one started.
+    """
+
+    num_records: int = 0
+    outstanding_at_start: ClassVar[list[int]] = []
+    outstanding: ClassVar[int] = 0
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def _request(self, resource_url, endpoint_path, params=None, conn_id=None):
+        cls = type(self)
+        with cls.lock:
+            cls.outstanding_at_start.append(cls.outstanding)
+            cls.outstanding += 1
+
+        page_number = params["offset"] // params["limit"]
+        time.sleep(0.01 * (page_number % 3))
+
+        with cls.lock:
+            cls.outstanding -= 1
+        stop = min(params["offset"] + params["limit"], self.num_records)
+        return [{"id": str(index)} for index in range(params["offset"], stop)]
+
+
+def list_slowly(num_records: int, max_in_flight: int) -> list[list[dict]]:
+    SlowListingResource.outstanding_at_start.clear()
+    resource = SlowListingResource(
+        base_url="https://api.example.com/",
+        conn_id="conn",
+        api_key="key",
+        page_size=2,
+        max_in_flight=max_in_flight,
+        num_records=num_records,
+    )
+    return list(resource.iter_invoice_pages())
+
+
+def test_pages_come_back_in_order():
+    pages = list_slowly(30, max_in_flight=3)
+
+    assert [record["id"] for page in pages for record in page] == [
+        str(index) for index in range(30)
+    ]
+
+
+def test_requests_in_flight_stay_within_max_in_flight():
+    list_slowly(30, max_in_flight=3)
+
+    # Counted before each request joins, so at most max_in_flight - 1.
+    assert max(SlowListingResource.outstanding_at_start) <= 2
+    assert max(SlowListingResource.outstanding_at_start) > 0
+
+
+def test_read_ahead_ramps_up_from_one_page():
+    list_slowly(30, max_in_flight=3)
+
+    # The first two pages are requested one at a time, before any read-ahead.
+    assert SlowListingResource.outstanding_at_start[:2] == [0, 0]
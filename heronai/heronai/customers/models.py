@@ -11,6 +11,8 @@ class Customer(models.Model):
     currency = models.CharField(max_length=10, blank=True, null=True)
     is_supplier = models.BooleanField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # Unified connection ID of the ledger the customer was ingested from.
+    tenant = models.CharField(max_length=100, blank=True, db_default="")
     created_at = models.DateTimeField()
     updated_at = models.DateTimeField()
 
@@ -18,6 +20,10 @@ class Customer(models.Model):
         db_table = "customers"
         verbose_name = "Customer"
         verbose_name_plural = "Customers"
+        indexes = [
+            # Per-tenant reads and reloads.
+            models.Index(fields=["tenant"], name="customers_tenant_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.company_name})" if self.company_name else self.name
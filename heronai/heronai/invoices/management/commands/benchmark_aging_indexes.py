@@ -0,0 +1,124 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from heronai.invoices.models import Invoice
+
+# Scratch schema the synthetic data lives in; dropped when the command ends.
+SCHEMA = "aging_benchmark"
+
+# The invoices table as 0001_initial created it: the primary key and the
+# foreign key index on customer_id only.
+CREATE_TABLES = [
+    f"CREATE SCHEMA {SCHEMA}",
+    f"SET search_path TO {SCHEMA}",
+    "CREATE TABLE customers (LIKE public.customers INCLUDING DEFAULTS)",
+    "ALTER TABLE customers ADD PRIMARY KEY (id)",
+    "CREATE TABLE invoices (LIKE public.invoices INCLUDING DEFAULTS)",
+    "ALTER TABLE invoices ADD PRIMARY KEY (invoice_id)",
+    "CREATE INDEX invoices_customer_id ON invoices (customer_id)",
+]
+
+POPULATE_CUSTOMERS = """
+INSERT INTO customers (id, name, is_active, created_at, updated_at)
+SELECT gen_random_uuid(), 'Customer ' || n, true, now(), now()
+FROM generate_series(1, %(customers)s) AS n
+"""
+
+# About a third of the invoices are settled; the rest are spread over the
+# aging buckets, mirroring what the ETL writes.
+POPULATE_INVOICES = """
+INSERT INTO invoices (
+    invoice_id, customer_id, invoice_number, balance_amount, created_at,
+    updated_at, due_at, days_overdue, aging_bucket, invoice_at, status, type,
+    notes
+)
+SELECT
+    gen_random_uuid(),
+    c.ids[1 + (d.n %% array_length(c.ids, 1))],
+    'INV-' || d.n,
+    CASE WHEN random() < 0.35 THEN 0 ELSE round((random() * 10000)::numeric, 2) END,
+    now(),
+    now(),
+    now() - make_interval(days => d.days),
+    GREATEST(d.days, 0),
+    CASE
+        WHEN d.days <= 0 THEN 0
+        WHEN d.days <= 30 THEN 1
+        WHEN d.days <= 60 THEN 2
+        WHEN d.days <= 90 THEN 3
+        WHEN d.days <= 120 THEN 4
+        ELSE 5
+    END,
+    now() - make_interval(days => d.days + 30),
+    'AUTHORIZED',
+    'INVOICE',
+    ''
+FROM (
+    SELECT n, (random() * 200)::int - 30 AS days
+    FROM generate_series(1, %(rows)s) AS n
+) AS d
+CROSS JOIN (SELECT array_agg(id) AS ids FROM customers) AS c
+"""
+
+QUERIES = {
+    "aging rollup": """
+        SELECT i.customer_id, i.aging_bucket, SUM(i.balance_amount)
+        FROM invoices AS i
+        WHERE i.customer_id IS NOT NULL AND i.balance_amount > 0
+        GROUP BY i.customer_id, i.aging_bucket
+    """,
+    "customer drill-down": """
+        SELECT aging_bucket, SUM(balance_amount)
+        FROM invoices
+        WHERE customer_id = (SELECT id FROM customers LIMIT 1)
+            AND balance_amount > 0
+        GROUP BY aging_bucket
+    """,
+    "due in the last week": """
+        SELECT COUNT(*)
+        FROM invoices
+        WHERE due_at >= now() - interval '7 days' AND due_at < now()
+    """,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads synthetic invoices into a scratch schema and prints the plans of "
+        "the aging queries before and after the Invoice model's indexes exist. "
+        "Requires PostgreSQL; the scratch schema is dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2_000_000)
+        parser.add_argument("--customers", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            try:
+                self.stdout.write(
+                    f"Loading {options['rows']:,} invoices for "
+                    f"{options['customers']:,} customers into {SCHEMA}",
+                )
+                for statement in CREATE_TABLES:
+                    cursor.execute(statement)
+                cursor.execute(POPULATE_CUSTOMERS, options)
+                cursor.execute(POPULATE_INVOICES, options)
+                cursor.execute("VACUUM ANALYZE invoices")
+                self.explain(cursor, "Before")
+
+                with connection.schema_editor() as schema_editor:
+                    for index in Invoice._meta.indexes:  # noqa: SLF001
+                        schema_editor.add_index(Invoice, index)
+                cursor.execute("VACUUM ANALYZE invoices")
+                self.explain(cursor, "After")
+            finally:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                cursor.execute("RESET search_path")
+
+    def explain(self, cursor, label):
+        for name, query in QUERIES.items():
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {name}"))
+            self.stdout.write(plan)
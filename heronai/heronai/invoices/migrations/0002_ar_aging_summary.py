@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CREATE_AGING_SUMMARY = """
+CREATE MATERIALIZED VIEW ar_aging_summary AS
+SELECT
+    i.customer_id,
+    c.name AS customer_name,
+    COALESCE(SUM(i.balance_amount) FILTER (WHERE i.aging_bucket = 0), 0) AS bucket_0,
+    COALESCE(SUM(i.balance_amount) FILTER (WHERE i.aging_bucket = 1), 0) AS bucket_1,
+    COALESCE(SUM(i.balance_amount) FILTER (WHERE i.aging_bucket = 2), 0) AS bucket_2,
+    COALESCE(SUM(i.balance_amount) FILTER (WHERE i.aging_bucket = 3), 0) AS bucket_3,
+    COALESCE(SUM(i.balance_amount) FILTER (WHERE i.aging_bucket = 4), 0) AS bucket_4,
+    COALESCE(SUM(i.balance_amount) FILTER (WHERE i.aging_bucket = 5), 0) AS bucket_5,
+    SUM(i.balance_amount) AS total_ar
+FROM invoices AS i
+JOIN customers AS c ON c.id = i.customer_id
+WHERE i.balance_amount > 0
+GROUP BY i.customer_id, c.name;
+
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY needs a unique index.
+CREATE UNIQUE INDEX ar_aging_summary_customer_id_uniq
+    ON ar_aging_summary (customer_id);
+"""
+
+DROP_AGING_SUMMARY = "DROP MATERIALIZED VIEW IF EXISTS ar_aging_summary;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("customers", "0002_customer_customer_id"),
+        ("invoices", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AgingSummary",
+            fields=[
+                (
+                    "customer",
+                    models.OneToOneField(
+                        db_column="customer_id",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="aging_summary",
+                        serialize=False,
+                        to="customers.customer",
+                    ),
+                ),
+                ("customer_name", models.CharField(max_length=255)),
+                ("bucket_0", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("bucket_1", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("bucket_2", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("bucket_3", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("bucket_4", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("bucket_5", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("total_ar", models.DecimalField(decimal_places=2, max_digits=15)),
+            ],
+            options={
+                "verbose_name": "AR Aging Summary",
+                "verbose_name_plural": "AR Aging Summaries",
+                "db_table": "ar_aging_summary",
+                "managed": False,
+            },
+        ),
+        migrations.RunSQL(CREATE_AGING_SUMMARY, reverse_sql=DROP_AGING_SUMMARY),
+    ]
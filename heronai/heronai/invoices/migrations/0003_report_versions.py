@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("invoices", "0002_ar_aging_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Report Version",
+                "verbose_name_plural": "Report Versions",
+                "db_table": "report_versions",
+            },
+        ),
+    ]
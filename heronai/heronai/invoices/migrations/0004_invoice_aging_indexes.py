@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:43
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking invoices against the ETL's writes.
+    atomic = False
+
+    dependencies = [
+        ("customers", "0002_customer_customer_id"),
+        ("invoices", "0003_report_versions"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("balance_amount__gt", 0)),
+                fields=["customer", "aging_bucket"],
+                include=("balance_amount",),
+                name="invoices_outstanding_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(fields=["due_at"], name="invoices_due_at_idx"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:09
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking invoices against the ETL's writes.
+    atomic = False
+
+    dependencies = [
+        ("invoices", "0004_invoice_aging_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoice",
+            name="tenant",
+            field=models.CharField(blank=True, db_default="", max_length=100),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(fields=["tenant"], name="invoices_tenant_idx"),
+        ),
+    ]
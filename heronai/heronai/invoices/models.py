@@ -1,6 +1,8 @@
 import uuid
 
+from django.db import connection
 from django.db import models
+from django.db.models import Q
 from django.db.models import Sum
 
 
@@ -68,12 +70,28 @@ class Invoice(models.Model):
         verbose_name="Invoice Type",
     )
     notes = models.TextField(blank=True)
+    # Unified connection ID of the ledger the invoice was ingested from.
+    tenant = models.CharField(max_length=100, blank=True, db_default="")
 
     class Meta:
         ordering = ["-created_at"]
         db_table = "invoices"
         verbose_name = "Invoice"
         verbose_name_plural = "Invoices"
+        indexes = [
+            # Covers the aging rollup: only outstanding invoices, grouped by
+            # customer and bucket, summed without visiting the heap.
+            models.Index(
+                fields=["customer", "aging_bucket"],
+                include=["balance_amount"],
+                condition=Q(balance_amount__gt=0),
+                name="invoices_outstanding_idx",
+            ),
+            # Re-aging and due-date range scans.
+            models.Index(fields=["due_at"], name="invoices_due_at_idx"),
+            # Per-tenant reads and reloads.
+            models.Index(fields=["tenant"], name="invoices_tenant_idx"),
+        ]
 
     def __str__(self):
         return f"Invoice {self.invoice_number} ({self.invoice_id})"
@@ -105,3 +123,71 @@ class Invoice(models.Model):
             .annotate(total_ar=Sum("balance_amount"))
             .order_by("customer__name", "aging_bucket")
         )
+
+
+class AgingSummary(models.Model):
+    """
+    Outstanding balance per customer and aging bucket, precomputed in the
+    `ar_aging_summary` materialized view and refreshed by the ETL after each
+    invoice/payment load.
+    """
+
+    customer = models.OneToOneField(
+        "customers.Customer",
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        related_name="aging_summary",
+        db_column="customer_id",
+    )
+    customer_name = models.CharField(max_length=255)
+    bucket_0 = models.DecimalField(max_digits=15, decimal_places=2)
+    bucket_1 = models.DecimalField(max_digits=15, decimal_places=2)
+    bucket_2 = models.DecimalField(max_digits=15, decimal_places=2)
+    bucket_3 = models.DecimalField(max_digits=15, decimal_places=2)
+    bucket_4 = models.DecimalField(max_digits=15, decimal_places=2)
+    bucket_5 = models.DecimalField(max_digits=15, decimal_places=2)
+    total_ar = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        managed = False
+        db_table = "ar_aging_summary"
+        verbose_name = "AR Aging Summary"
+        verbose_name_plural = "AR Aging Summaries"
+
+    def __str__(self):
+        return f"{self.customer_name}: {self.total_ar}"
+
+    @classmethod
+    def refresh(cls, *, concurrently=True):
+        """Recompute the materialized view from the `invoices` table."""
+        concurrent = "CONCURRENTLY " if concurrently else ""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"REFRESH MATERIALIZED VIEW {concurrent}{cls._meta.db_table}",
+            )
+
+
+class ReportVersion(models.Model):
+    """
+    Monotonic version of a precomputed report. The ETL bumps it in the same
+    transaction that refreshes the report's data, so cache keys built from it
+    go stale exactly when the data changes.
+    """
+
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "report_versions"
+        verbose_name = "Report Version"
+        verbose_name_plural = "Report Versions"
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+    @classmethod
+    def current(cls, name):
+        """Current version of the `name` report, 0 if it was never bumped."""
+        version = cls.objects.filter(name=name).values_list("version", flat=True)
+        return version.first() or 0
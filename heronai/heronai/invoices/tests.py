@@ -1,3 +1,133 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.utils import timezone
+
+from heronai.customers.models import Customer
+from heronai.invoices.models import AgingSummary
+from heronai.invoices.models import Invoice
+from heronai.invoices.models import ReportVersion
+from heronai.invoices.views import AGING_REPORT
+from heronai.invoices.views import InvoiceListView
+from heronai.invoices.views import aging_report_cache_key
+from heronai.invoices.views import get_aging_report
+
+pytestmark = pytest.mark.django_db
+
+requires_postgres = pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="ar_aging_summary is a PostgreSQL materialized view",
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+def make_customer(name: str) -> Customer:
+    now = timezone.now()
+    return Customer.objects.create(name=name, created_at=now, updated_at=now)
+
+
+def make_invoice(customer, balance, aging_bucket) -> Invoice:
+    now = timezone.now()
+    return Invoice.objects.create(
+        customer=customer,
+        invoice_number="INV",
+        balance_amount=Decimal(balance),
+        aging_bucket=aging_bucket,
+        due_at=now - timedelta(days=30 * aging_bucket),
+        invoice_at=now - timedelta(days=30 * aging_bucket + 30),
+    )
+
+
+def bump_report_version(name=AGING_REPORT):
+    report, _ = ReportVersion.objects.get_or_create(name=name)
+    report.version += 1
+    report.save()
+
+
+@requires_postgres
+class TestInvoiceListView:
+    def get_context(self, rf: RequestFactory):
+        AgingSummary.refresh(concurrently=False)
+        view = InvoiceListView()
+        view.setup(rf.get("/invoices/"))
+        view.object_list = view.get_queryset()
+        return view.get_context_data()
+
+    def test_pivots_balances_by_customer_and_bucket(self, rf: RequestFactory):
+        acme = make_customer("Acme")
+        globex = make_customer("Globex")
+        make_invoice(acme, "100.00", 1)
+        make_invoice(acme, "50.00", 1)
+        make_invoice(acme, "25.00", 4)
+        make_invoice(globex, "10.00", 5)
+
+        rows = list(self.get_context(rf)["customer_aging_data"])
+
+        assert [row["customer_name"] for row in rows] == ["Acme", "Globex"]
+        assert rows[0]["bucket_1"] == Decimal("150.00")
+        assert rows[0]["bucket_4"] == Decimal("25.00")
+        assert rows[0]["bucket_5"] == Decimal("0.00")
+        assert rows[0]["total_ar"] == Decimal("175.00")
+        assert rows[1]["bucket_5"] == Decimal("10.00")
+
+    def test_totals(self, rf: RequestFactory):
+        acme = make_customer("Acme")
+        make_invoice(acme, "100.00", 1)
+        make_invoice(acme, "40.00", 3)
+        make_invoice(acme, "5.00", 0)
+
+        totals = self.get_context(rf)["totals"]
+
+        assert totals["bucket_1"] == Decimal("100.00")
+        assert totals["bucket_2"] == Decimal("0.00")
+        assert totals["bucket_3"] == Decimal("40.00")
+        assert totals["grand_total"] == Decimal("140.00")
+
+    def test_excludes_settled_and_unassigned_invoices(self, rf: RequestFactory):
+        acme = make_customer("Acme")
+        make_invoice(acme, "0.00", 2)
+        make_invoice(None, "75.00", 2)
+
+        context = self.get_context(rf)
+
+        assert list(context["customer_aging_data"]) == []
+        assert context["totals"]["grand_total"] == Decimal("0.00")
+
+
+class TestAgingReportCache:
+    def test_cache_key_follows_report_version(self):
+        before = aging_report_cache_key()
+        bump_report_version("another_report")
+        assert aging_report_cache_key() == before
+
+        bump_report_version()
+        assert aging_report_cache_key() != before
+
+    @requires_postgres
+    def test_serves_cached_report_until_version_bump(self):
+        acme = make_customer("Acme")
+        make_invoice(acme, "100.00", 1)
+        AgingSummary.refresh(concurrently=False)
+        assert get_aging_report()["totals"]["grand_total"] == Decimal("100.00")
+
+        make_invoice(acme, "50.00", 2)
+        AgingSummary.refresh(concurrently=False)
+        assert get_aging_report()["totals"]["grand_total"] == Decimal("100.00")
+
+        bump_report_version()
+        assert get_aging_report()["totals"]["grand_total"] == Decimal("150.00")
+
+
+class TestTenant:
+    def test_rows_loaded_without_a_tenant_default_to_blank(self):
+        invoice = make_invoice(make_customer("Acme"), "100.00", 1)
+        invoice.refresh_from_db()
+        assert invoice.tenant == ""
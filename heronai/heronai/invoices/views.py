@@ -1,9 +1,15 @@
 import logging
-from collections import defaultdict
+from decimal import Decimal
 
+from django.core.cache import cache
+from django.db.models import DecimalField
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from django.views.generic import ListView
 
-from .models import Invoice
+from .models import AgingSummary
+from .models import ReportVersion
 
 logger = logging.getLogger(__name__)
 
@@ -14,75 +20,73 @@ BUCKET_3 = 3  # 61-90 Days
 BUCKET_4 = 4  # 91-120 Days
 BUCKET_5 = 5  # Over 120 Days
 
+AGING_BUCKETS = (BUCKET_1, BUCKET_2, BUCKET_3, BUCKET_4, BUCKET_5)
+
+# Report name the ETL bumps in `report_versions` after refreshing the summary.
+AGING_REPORT = "ar_aging"
+# Entries are keyed by version, so stale ones are never read again; the timeout
+# only bounds how long they linger in the cache.
+AGING_REPORT_CACHE_TIMEOUT = 60 * 60 * 24
+
+ZERO = Value(Decimal(0), output_field=DecimalField(max_digits=15, decimal_places=2))
+
+
+def bucket_column(bucket):
+    return f"bucket_{bucket}"
+
+
+def aging_report_cache_key():
+    return f"invoices:aging_report:v{ReportVersion.current(AGING_REPORT)}"
+
+
+def build_aging_report():
+    """Outstanding balances per customer and aging bucket, plus their totals."""
+    # Rows come precomputed from the ar_aging_summary materialized view,
+    # which the ETL refreshes after every invoice/payment load, so this is
+    # a scan over one row per customer rather than over every invoice.
+    rows = list(
+        AgingSummary.objects.values(
+            "customer_name",
+            *(bucket_column(bucket) for bucket in AGING_BUCKETS),
+            "total_ar",
+        ).order_by("customer_name"),
+    )
+
+    totals = AgingSummary.objects.aggregate(
+        **{
+            bucket_column(bucket): Coalesce(Sum(bucket_column(bucket)), ZERO)
+            for bucket in AGING_BUCKETS
+        },
+    )
+    totals["grand_total"] = sum(totals.values(), Decimal(0))
+    return {"rows": rows, "totals": totals}
+
+
+def get_aging_report():
+    """
+    The aging report, cached until the ETL bumps the report version, so
+    dashboard hits between loads cost one primary key lookup.
+    """
+    return cache.get_or_set(
+        aging_report_cache_key(),
+        build_aging_report,
+        timeout=AGING_REPORT_CACHE_TIMEOUT,
+    )
+
 
 class InvoiceListView(ListView):
-    model = Invoice
+    model = AgingSummary
     context_object_name = "customer_aging_data"
     template_name = "invoices/invoice_list.html"
 
     def get_queryset(self):
-        """Get invoices grouped by customer and aging bucket."""
-        # Get all invoices with customer information
-        invoices = Invoice.objects.select_related("customer").filter(
-            customer__isnull=False,
-            balance_amount__gt=0,  # Only show invoices with outstanding balance
-        ).values(
-            "customer__name",
-            "aging_bucket",
-            "balance_amount",
-        )
-
-        # Group by customer and aging bucket
-        customer_data = defaultdict(lambda: {
-            "customer_name": "",
-            "bucket_1": 0,
-            "bucket_2": 0,
-            "bucket_3": 0,
-            "bucket_4": 0,
-            "bucket_5": 0,
-            "total_ar": 0,
-        })
-
-        for invoice in invoices:
-            customer_name = invoice["customer__name"]
-            aging_bucket = invoice["aging_bucket"]
-            balance_amount = float(invoice["balance_amount"] or 0)
-
-            if customer_name not in customer_data:
-                customer_data[customer_name]["customer_name"] = customer_name
-
-            # Add to appropriate bucket
-            if aging_bucket == BUCKET_1:
-                customer_data[customer_name]["bucket_1"] += balance_amount
-            elif aging_bucket == BUCKET_2:
-                customer_data[customer_name]["bucket_2"] += balance_amount
-            elif aging_bucket == BUCKET_3:
-                customer_data[customer_name]["bucket_3"] += balance_amount
-            elif aging_bucket == BUCKET_4:
-                customer_data[customer_name]["bucket_4"] += balance_amount
-            elif aging_bucket == BUCKET_5:
-                customer_data[customer_name]["bucket_5"] += balance_amount
-
-            # Add to total AR
-            customer_data[customer_name]["total_ar"] += balance_amount
-
-        return list(customer_data.values())
+        """Get outstanding balances pivoted by customer and aging bucket."""
+        self.report = get_aging_report()
+        return self.report["rows"]
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-
-        # Calculate totals
-        customer_data = context["customer_aging_data"]
-        totals = {
-            "bucket_1": sum(customer["bucket_1"] for customer in customer_data),
-            "bucket_2": sum(customer["bucket_2"] for customer in customer_data),
-            "bucket_3": sum(customer["bucket_3"] for customer in customer_data),
-            "bucket_4": sum(customer["bucket_4"] for customer in customer_data),
-            "bucket_5": sum(customer["bucket_5"] for customer in customer_data),
-        }
-        totals["grand_total"] = sum(totals.values())
-
-        context["totals"] = totals
+        context["totals"] = self.report["totals"]
         return context
 
 
@@ -23,6 +23,8 @@ class Payment(models.Model):
     account_id = models.UUIDField(blank=True, null=True)
     total_amount = models.DecimalField(max_digits=15, decimal_places=2)
     currency = models.CharField(max_length=10)
+    # Unified connection ID of the ledger the payment was ingested from.
+    tenant = models.CharField(max_length=100, blank=True, db_default="")
     created_at = models.DateTimeField()
     updated_at = models.DateTimeField()
 
@@ -30,6 +32,10 @@ class Payment(models.Model):
         db_table = "payments"
         verbose_name = "Payment"
         verbose_name_plural = "Payments"
+        indexes = [
+            # Per-tenant reads and reloads.
+            models.Index(fields=["tenant"], name="payments_tenant_idx"),
+        ]
 
     def __str__(self):
         return f"Payment {self.payment_id} ({self.currency} {self.total_amount})"